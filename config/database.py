@@ -9,10 +9,24 @@ import sqlite3
 import os
 import json
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Tuple
+from sys import intern
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable
+from urllib.request import pathname2url
 import logging
 
 
+# 取值种类很少的会话字段，逐条读取时驻留字符串，相同的值共用一个对象
+_INTERNED_SESSION_FIELDS = ('timer_type', 'date')
+
+# 导入会话记录时使用的插入语句
+_INSERT_SESSION_SQL = '''
+    INSERT INTO study_sessions (id, date, start_time, end_time, timer_type,
+                                planned_duration, actual_duration, completed,
+                                notes, todo_id, todo_content)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
 class Database:
     """数据库管理类"""
 
@@ -42,6 +56,16 @@ class Database:
             self.connection.row_factory = sqlite3.Row  # 使结果可以按列名访问
         return self.connection
 
+    def open_readonly_connection(self) -> sqlite3.Connection:
+        """
+        打开一个独立的只读连接（用于多线程并行导出）
+
+        Returns:
+            只读数据库连接，由调用方负责关闭
+        """
+        uri = f"file:{pathname2url(os.path.abspath(self.db_file))}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
     def _is_connection_closed(self) -> bool:
         """检查连接是否已关闭"""
         try:
@@ -238,20 +262,22 @@ class Database:
             self.logger.error(f"添加TODO项目失败: {e}")
             raise
             
-    def get_todo_items(self, date_str: str = None, include_completed: bool = False) -> List[Dict]:
+    def get_todo_items(self, date_str: str = None, include_completed: bool = False,
+                       conn: sqlite3.Connection = None) -> List[Dict]:
         """
         获取指定日期的TODO项目列表
         
         Args:
             date_str: 日期字符串，格式为YYYY-MM-DD，默认为今天
             include_completed: 是否包含已完成的项目
+            conn: 使用的数据库连接，为None时使用默认连接（后台线程应传入独立连接）
             
         Returns:
             TODO项目列表
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            cursor = (conn or self._get_connection()).cursor()
+            cursor.row_factory = sqlite3.Row
             
             # 如果没有提供日期，则使用今天的日期
             if date_str is None:
@@ -617,72 +643,13 @@ class Database:
             conn = self._get_connection()
             cursor = conn.cursor()
             
-            # 转换时间格式
-            session_date = date.fromisoformat(date_str)
+            session_date, row = self._session_row(
+                cursor, date_str, start_time, end_time, duration_minutes, notes, todo_id,
+                timer_type, planned_duration, actual_duration, completed, todo_content, id
+            )
             
-            # 解析开始和结束时间
-            if len(start_time.split()) == 1:  # 只有时间部分
-                start_datetime = datetime.strptime(f"{date_str} {start_time}", "%Y-%m-%d %H:%M:%S")
-            else:  # 完整的日期时间
-                start_datetime = datetime.fromisoformat(start_time)
-                
-            if end_time:
-                if len(end_time.split()) == 1:  # 只有时间部分
-                    end_datetime = datetime.strptime(f"{date_str} {end_time}", "%Y-%m-%d %H:%M:%S")
-                else:  # 完整的日期时间
-                    end_datetime = datetime.fromisoformat(end_time)
-            else:
-                end_datetime = None
-            
-            # 转换持续时间为秒
-            if actual_duration is None:
-                actual_duration = int(duration_minutes * 60)
-            if planned_duration is None:
-                planned_duration = actual_duration  # 假设计划时长等于实际时长
-            
-            # 获取待办内容（如果有）
-            if todo_id and not todo_content:
-                cursor.execute('SELECT content FROM todo_items WHERE id = ?', (todo_id,))
-                result = cursor.fetchone()
-                if result:
-                    todo_content = result['content']
-            
-            # 检查表中是否存在todo_id字段
-            cursor.execute("PRAGMA table_info(study_sessions)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            # 检查是否存在todo_content字段
-            has_todo_content = 'todo_content' in columns
-            
-            if 'todo_id' in columns and has_todo_content:
-                cursor.execute('''
-                               INSERT INTO study_sessions (id, date, start_time, end_time, timer_type, 
-                                                          planned_duration, actual_duration, completed, 
-                                                          notes, todo_id, todo_content)
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                               ''', (id, session_date, start_datetime, end_datetime, timer_type,
-                                   planned_duration, actual_duration, completed, notes, todo_id, todo_content))
-            elif 'todo_id' in columns and not has_todo_content:
-                # 添加todo_content字段
-                cursor.execute('ALTER TABLE study_sessions ADD COLUMN todo_content TEXT')
-                cursor.execute('''
-                               INSERT INTO study_sessions (id, date, start_time, end_time, timer_type, 
-                                                          planned_duration, actual_duration, completed, 
-                                                          notes, todo_id, todo_content)
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                               ''', (id, session_date, start_datetime, end_datetime, timer_type,
-                                   planned_duration, actual_duration, completed, notes, todo_id, todo_content))
-            elif not 'todo_id' in columns:
-                # 添加todo_id和todo_content字段
-                cursor.execute('ALTER TABLE study_sessions ADD COLUMN todo_id INTEGER')
-                cursor.execute('ALTER TABLE study_sessions ADD COLUMN todo_content TEXT')
-                cursor.execute('''
-                               INSERT INTO study_sessions (id, date, start_time, end_time, timer_type, 
-                                                          planned_duration, actual_duration, completed, 
-                                                          notes, todo_id, todo_content)
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                               ''', (id, session_date, start_datetime, end_datetime, timer_type,
-                                   planned_duration, actual_duration, completed, notes, todo_id, todo_content))
+            self._ensure_session_todo_columns(cursor)
+            cursor.execute(_INSERT_SESSION_SQL, row)
             
             session_id = cursor.lastrowid
             conn.commit()
@@ -697,6 +664,129 @@ class Database:
             self.logger.error(f"直接添加会话记录失败: {e}")
             raise
     
+    def add_sessions_bulk(self, sessions: Iterable[Tuple]) -> int:
+        """
+        批量添加学习会话记录（用于数据导入），所有记录在一个事务中插入
+        
+        Args:
+            sessions: 记录参数元组序列，每个元组的参数顺序与add_session_direct相同
+            
+        Returns:
+            成功导入的记录数，格式错误或与已有记录冲突的记录会被跳过
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # 先在Python中完成格式转换，跳过无法解析的记录
+        rows = []
+        session_dates = []
+        # 同一待办关联多条记录时只查询一次待办内容
+        todo_contents = {}
+        for args in sessions:
+            try:
+                session_date, row = self._session_row(cursor, *args, todo_contents=todo_contents)
+            except Exception as e:
+                self.logger.warning(f"导入记录失败: {e}")
+                continue
+            rows.append(row)
+            session_dates.append(session_date)
+        
+        if not rows:
+            return 0
+        
+        try:
+            self._ensure_session_todo_columns(cursor)
+            try:
+                # 同一条预编译语句绑定所有记录的参数执行
+                cursor.executemany(_INSERT_SESSION_SQL, rows)
+                inserted_dates = session_dates
+            except sqlite3.IntegrityError:
+                # 整批失败时回滚，再逐条插入以跳过冲突的记录
+                conn.rollback()
+                inserted_dates = []
+                for row, session_date in zip(rows, session_dates):
+                    try:
+                        cursor.execute(_INSERT_SESSION_SQL, row)
+                        inserted_dates.append(session_date)
+                    except sqlite3.IntegrityError as e:
+                        self.logger.warning(f"导入记录失败: {e}")
+            conn.commit()
+            
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"批量添加会话记录失败: {e}")
+            raise
+        
+        # 每个涉及的日期只更新一次统计数据
+        for session_date in set(inserted_dates):
+            self._update_daily_stats(session_date)
+        
+        self.logger.info(f"批量添加会话记录: {len(inserted_dates)} 条")
+        return len(inserted_dates)
+    
+    def _session_row(self, cursor: sqlite3.Cursor, date_str: str, start_time: str, end_time: str,
+                     duration_minutes: float, notes: str = "", todo_id: int = None,
+                     timer_type: str = "study", planned_duration: int = None,
+                     actual_duration: int = None, completed: bool = True,
+                     todo_content: str = "", id: int = None, *,
+                     todo_contents: Dict = None) -> Tuple[date, Tuple]:
+        """
+        把导入的记录参数转换为_INSERT_SESSION_SQL的参数
+        
+        Args:
+            todo_contents: 批量导入时缓存已查询的待办（待办ID -> 查询结果），为None时不缓存
+        
+        Returns:
+            (会话日期, 插入参数元组)
+        """
+        # 转换时间格式
+        session_date = date.fromisoformat(date_str)
+        
+        # 解析开始和结束时间
+        if len(start_time.split()) == 1:  # 只有时间部分
+            start_datetime = datetime.strptime(f"{date_str} {start_time}", "%Y-%m-%d %H:%M:%S")
+        else:  # 完整的日期时间
+            start_datetime = datetime.fromisoformat(start_time)
+            
+        if end_time:
+            if len(end_time.split()) == 1:  # 只有时间部分
+                end_datetime = datetime.strptime(f"{date_str} {end_time}", "%Y-%m-%d %H:%M:%S")
+            else:  # 完整的日期时间
+                end_datetime = datetime.fromisoformat(end_time)
+        else:
+            end_datetime = None
+        
+        # 转换持续时间为秒
+        if actual_duration is None:
+            actual_duration = int(duration_minutes * 60)
+        if planned_duration is None:
+            planned_duration = actual_duration  # 假设计划时长等于实际时长
+        
+        # 获取待办内容（如果有）
+        if todo_id and not todo_content:
+            if todo_contents is not None and todo_id in todo_contents:
+                result = todo_contents[todo_id]
+            else:
+                cursor.execute('SELECT content FROM todo_items WHERE id = ?', (todo_id,))
+                result = cursor.fetchone()
+                if todo_contents is not None:
+                    todo_contents[todo_id] = result
+            if result:
+                todo_content = result['content']
+        
+        return session_date, (id, session_date, start_datetime, end_datetime, timer_type,
+                              planned_duration, actual_duration, completed, notes, todo_id, todo_content)
+    
+    def _ensure_session_todo_columns(self, cursor: sqlite3.Cursor):
+        """旧版本数据库缺少todo_id和todo_content字段时添加"""
+        cursor.execute("PRAGMA table_info(study_sessions)")
+        columns = [column[1] for column in cursor.fetchall()]
+        
+        if 'todo_id' not in columns:
+            cursor.execute('ALTER TABLE study_sessions ADD COLUMN todo_id INTEGER')
+        if 'todo_content' not in columns:
+            cursor.execute('ALTER TABLE study_sessions ADD COLUMN todo_content TEXT')
+    
     def get_daily_sessions(self, target_date: date = None) -> List[Dict]:
         """
         获取指定日期的学习会话记录
@@ -895,6 +985,38 @@ class Database:
         start_date = end_date - timedelta(days=days - 1)
         return self.get_daily_stats(start_date, end_date)
 
+    def _query_all_sessions(self, cursor: sqlite3.Cursor):
+        """在给定游标上执行查询所有学习会话记录的语句"""
+        cursor.execute(self._all_sessions_sql(cursor))
+
+    def _all_sessions_sql(self, cursor: sqlite3.Cursor) -> str:
+        """根据表结构生成查询所有学习会话记录的语句"""
+        # 检查表中是否存在todo_id和todo_content字段
+        cursor.execute("PRAGMA table_info(study_sessions)")
+        columns = [column[1] for column in cursor.fetchall()]
+        has_todo_id = 'todo_id' in columns
+        has_todo_content = 'todo_content' in columns
+
+        # 构建查询语句，确保包含所有字段
+        if has_todo_id and has_todo_content:
+            return '''
+                SELECT * FROM study_sessions 
+                ORDER BY start_time DESC
+            '''
+        elif has_todo_id and not has_todo_content:
+            # 如果有todo_id但没有todo_content，通过连表查询获取
+            return '''
+                SELECT s.*, t.content as todo_content FROM study_sessions s
+                LEFT JOIN todo_items t ON s.todo_id = t.id
+                ORDER BY s.start_time DESC
+            '''
+        else:
+            # 如果没有todo_id字段，直接查询所有字段
+            return '''
+                SELECT * FROM study_sessions 
+                ORDER BY start_time DESC
+            '''
+
     def get_all_sessions(self) -> List[Dict]:
         """
         获取所有学习会话记录
@@ -905,32 +1027,7 @@ class Database:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-
-            # 检查表中是否存在todo_id和todo_content字段
-            cursor.execute("PRAGMA table_info(study_sessions)")
-            columns = [column[1] for column in cursor.fetchall()]
-            has_todo_id = 'todo_id' in columns
-            has_todo_content = 'todo_content' in columns
-
-            # 构建查询语句，确保包含所有字段
-            if has_todo_id and has_todo_content:
-                cursor.execute('''
-                    SELECT * FROM study_sessions 
-                    ORDER BY start_time DESC
-                ''')
-            elif has_todo_id and not has_todo_content:
-                # 如果有todo_id但没有todo_content，通过连表查询获取
-                cursor.execute('''
-                    SELECT s.*, t.content as todo_content FROM study_sessions s
-                    LEFT JOIN todo_items t ON s.todo_id = t.id
-                    ORDER BY s.start_time DESC
-                ''')
-            else:
-                # 如果没有todo_id字段，直接查询所有字段
-                cursor.execute('''
-                    SELECT * FROM study_sessions 
-                    ORDER BY start_time DESC
-                ''')
+            self._query_all_sessions(cursor)
 
             results = cursor.fetchall()
             return [dict(row) for row in results]
@@ -938,7 +1035,151 @@ class Database:
         except Exception as e:
             self.logger.error(f"获取所有会话记录失败: {e}")
             return []
+
+    def count_sessions(self, conn: sqlite3.Connection = None) -> int:
+        """
+        获取学习会话记录总数
+
+        Args:
+            conn: 使用的数据库连接，为None时使用默认连接
+
+        Returns:
+            会话记录数量，查询失败时返回0
+        """
+        try:
+            conn = conn or self._get_connection()
+            return conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]
+
+        except Exception as e:
+            self.logger.error(f"获取会话记录数量失败: {e}")
+            return 0
+
+    def iter_sessions(self, batch_size: int = 5000,
+                      conn: sqlite3.Connection = None) -> Iterator[Dict]:
+        """
+        逐条获取所有学习会话记录（分批从游标读取，不一次性载入内存）
+
+        Args:
+            batch_size: 每次从游标读取的行数
+            conn: 使用的数据库连接，为None时使用默认连接（后台线程应传入独立连接）
+
+        Returns:
+            会话记录迭代器，顺序与get_all_sessions相同
+
+        Raises:
+            sqlite3.Error: 查询失败时抛出，便于导出时提示错误
+        """
+        try:
+            cursor = (conn or self._get_connection()).cursor()
+            cursor.row_factory = sqlite3.Row
+            self._query_all_sessions(cursor)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    session = dict(row)
+                    for field in _INTERNED_SESSION_FIELDS:
+                        value = session.get(field)
+                        if type(value) is str:
+                            session[field] = intern(value)
+                    yield session
+
+        except Exception as e:
+            self.logger.error(f"读取会话记录失败: {e}")
+            raise
     
+    def iter_session_values(self, columns: List[str], batch_size: int = 5000,
+                            conn: sqlite3.Connection = None) -> Iterator[str]:
+        """
+        逐条生成学习会话记录的SQL字面量元组，如 (1,'2024-01-01',...)
+
+        与iterdump相同，各列字面量由sqlite的quote()生成，不在Python中拼接和转义
+
+        Args:
+            columns: 要输出的列，表中不存在的列输出NULL
+            batch_size: 每次从游标读取的行数
+            conn: 使用的数据库连接，为None时使用默认连接（后台线程应传入独立连接）
+
+        Returns:
+            字面量元组迭代器，顺序与get_all_sessions相同
+
+        Raises:
+            sqlite3.Error: 查询失败时抛出，便于导出时提示错误
+        """
+        try:
+            cursor = (conn or self._get_connection()).cursor()
+            sessions_sql = self._all_sessions_sql(cursor)
+            available = self._session_result_columns(cursor, sessions_sql)
+            values = " || ',' || ".join(
+                f'quote("{column}")' if column in available else "'NULL'" for column in columns
+            )
+
+            cursor.execute(f"SELECT '(' || {values} || ')' FROM ({sessions_sql})")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+
+        except Exception as e:
+            self.logger.error(f"读取会话记录失败: {e}")
+            raise
+
+    def iter_session_rows(self, columns: List[str], batch_size: int = 5000,
+                          conn: sqlite3.Connection = None,
+                          defaults: Dict = None) -> Iterator[tuple]:
+        """
+        逐条获取学习会话记录中指定列的值，按columns顺序返回元组，不为每条记录构造字典
+
+        Args:
+            columns: 要输出的列
+            batch_size: 每次从游标读取的行数
+            conn: 使用的数据库连接，为None时使用默认连接（后台线程应传入独立连接）
+            defaults: 表中不存在的列使用的值，未指定的列为None
+
+        Returns:
+            记录值元组迭代器，顺序与get_all_sessions相同
+
+        Raises:
+            sqlite3.Error: 查询失败时抛出，便于导出时提示错误
+        """
+        try:
+            defaults = defaults or {}
+            cursor = (conn or self._get_connection()).cursor()
+            # 默认连接按列名返回sqlite3.Row，这里直接使用元组
+            cursor.row_factory = None
+            sessions_sql = self._all_sessions_sql(cursor)
+            available = self._session_result_columns(cursor, sessions_sql)
+
+            # 不存在的列以参数形式绑定默认值
+            fields = []
+            params = []
+            for column in columns:
+                if column in available:
+                    fields.append(f'"{column}"')
+                else:
+                    fields.append('?')
+                    params.append(defaults.get(column))
+
+            cursor.execute(f"SELECT {', '.join(fields)} FROM ({sessions_sql})", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+        except Exception as e:
+            self.logger.error(f"读取会话记录失败: {e}")
+            raise
+
+    def _session_result_columns(self, cursor: sqlite3.Cursor, sessions_sql: str) -> set:
+        """获取查询所有学习会话记录的结果中实际存在的列"""
+        cursor.execute(f"SELECT * FROM ({sessions_sql}) LIMIT 0")
+        return {description[0] for description in cursor.description}
+
     def get_session_history(self, start_date: date = None, end_date: date = None,
                             timer_type: str = None, limit: int = 100) -> List[Dict]:
         """
@@ -1324,16 +1565,17 @@ class Database:
         cursor.execute('SELECT * FROM study_sessions ORDER BY start_time')
 
         with open(export_file, 'w', newline='', encoding='utf-8-sig') as f:
-            if cursor.fetchone():
-                cursor.execute('SELECT * FROM study_sessions ORDER BY start_time')
+            first_row = cursor.fetchone()
+            if first_row:
                 writer = csv.writer(f)
 
                 # 写入表头
                 headers = [description[0] for description in cursor.description]
                 writer.writerow(headers)
 
-                # 写入数据
-                writer.writerows(cursor.fetchall())
+                # 写入数据，直接迭代游标逐行写入，不一次性载入所有记录
+                writer.writerow(first_row)
+                writer.writerows(cursor)
 
     def clean_old_data(self, retention_days: int = 365):
         """
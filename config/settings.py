@@ -7,10 +7,17 @@
 
 import json
 import os
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Iterable, Tuple, Optional
 import logging
 
 
+@lru_cache(maxsize=None)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """拆分点号分隔的配置键（结果缓存，同一个键只拆分一次）"""
+    return tuple(key.split('.'))
+
+
 class Settings:
     """设置管理类"""
 
@@ -24,6 +31,8 @@ class Settings:
         self.config_file = config_file
         self.logger = logging.getLogger(__name__)
         self._settings = {}
+        # 计时器类型ID -> 类型字典，首次按ID查找时建立，修改计时器设置后失效
+        self._timer_type_index: Optional[Dict[str, Dict]] = None
         self._default_settings = self._get_default_settings()
         self.load()
 
@@ -95,6 +104,7 @@ class Settings:
 
     def load(self):
         """加载配置文件"""
+        self._timer_type_index = None
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
@@ -113,19 +123,36 @@ class Settings:
             self.logger.error(f"配置文件加载失败: {e}")
             self._settings = self._default_settings.copy()
 
-    def save(self):
-        """保存配置到文件"""
+    def save(self, content: str = None) -> bool:
+        """
+        保存配置到文件
+
+        Args:
+            content: 预先序列化的配置内容（见to_json），为None时序列化当前配置
+
+        Returns:
+            是否保存成功
+        """
         try:
+            if content is None:
+                content = self.to_json()
+
             # 确保目录存在
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
 
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=4, ensure_ascii=False)
+                f.write(content)
 
             self.logger.info("配置文件保存成功")
+            return True
 
         except Exception as e:
             self.logger.error(f"配置文件保存失败: {e}")
+            return False
+
+    def to_json(self) -> str:
+        """将当前配置序列化为JSON文本"""
+        return json.dumps(self._settings, indent=4, ensure_ascii=False)
 
     def _merge_settings(self, default: Dict, loaded: Dict) -> Dict:
         """
@@ -162,7 +189,7 @@ class Settings:
         Returns:
             配置值
         """
-        keys = key.split('.')
+        keys = _split_key(key)
         value = self._settings
 
         try:
@@ -180,7 +207,7 @@ class Settings:
             key: 配置键，支持点号分隔的嵌套键
             value: 配置值
         """
-        keys = key.split('.')
+        keys = _split_key(key)
         target = self._settings
 
         # 导航到最后一级的父字典
@@ -192,25 +219,55 @@ class Settings:
         # 设置值
         target[keys[-1]] = value
 
+        if keys[0] == 'timer':
+            self._timer_type_index = None
+
+    def get_many(self, keys_with_defaults: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        批量获取配置值
+
+        Args:
+            keys_with_defaults: (配置键, 默认值) 序列
+
+        Returns:
+            配置键到配置值的映射
+        """
+        return {key: self.get(key, default) for key, default in keys_with_defaults}
+
+    def update(self, values: Dict[str, Any]):
+        """
+        批量设置配置值
+
+        Args:
+            values: 配置键到配置值的映射，键支持点号分隔的嵌套键
+        """
+        for key, value in values.items():
+            self.set(key, value)
+
     def get_timer_types(self) -> List[Dict]:
         """获取计时器类型列表"""
         return self.get('timer.types', [])
 
+    def _get_timer_type_index(self) -> Dict[str, Dict]:
+        """获取计时器类型ID索引（缓存，计时器设置修改后重建）"""
+        if self._timer_type_index is None:
+            index = {}
+            for timer_type in self.get_timer_types():
+                # 与线性查找一致，ID重复时取第一个
+                index.setdefault(timer_type.get('id'), timer_type)
+            self._timer_type_index = index
+        return self._timer_type_index
+
     def get_timer_type_by_id(self, type_id: str) -> Dict:
         """根据ID获取计时器类型"""
-        types = self.get_timer_types()
-        for timer_type in types:
-            if timer_type.get('id') == type_id:
-                return timer_type
-        return {}
+        return self._get_timer_type_index().get(type_id, {})
 
     def add_timer_type(self, timer_type: Dict):
         """添加新的计时器类型"""
         types = self.get_timer_types()
 
         # 检查ID是否已存在
-        existing_ids = [t.get('id') for t in types]
-        if timer_type.get('id') in existing_ids:
+        if timer_type.get('id') in self._get_timer_type_index():
             raise ValueError(f"计时器类型ID '{timer_type.get('id')}' 已存在")
 
         types.append(timer_type)
@@ -255,11 +312,18 @@ class Settings:
         else:
             raise ValueError(f"计时器类型 '{type_id}' 不存在")
 
-    def reset_to_defaults(self):
-        """重置为默认设置"""
+    def reset_to_defaults(self) -> Dict[str, Any]:
+        """
+        重置为默认设置
+
+        Returns:
+            重置后的设置
+        """
         self._settings = self._default_settings.copy()
+        self._timer_type_index = None
         self.save()
         self.logger.info("设置已重置为默认值")
+        return self._settings
 
 
 # 全局设置实例（单例模式）
@@ -6,6 +6,7 @@
 """
 
 import os
+import time
 import logging
 import threading
 from typing import Optional
@@ -21,15 +22,22 @@ except ImportError:
     except ImportError:
         AUDIO_BACKEND = "none"
 
+# 音频文件存在性检查结果的有效期（秒）
+EXISTS_CACHE_TTL = 30
+
 
 class AudioManager:
     """音频管理类"""
 
+    __slots__ = ('logger', 'is_playing', 'stop_event', 'pygame_available', '_exists_cache')
+
     def __init__(self):
         """初始化音频管理器"""
         self.logger = logging.getLogger(__name__)
         self.is_playing = False
         self.stop_event = threading.Event()
+        # 音频文件路径 -> 最近一次确认存在的时间（monotonic）
+        self._exists_cache = {}
         
         # 尝试初始化pygame音频（即使当前后端不是pygame）
         try:
@@ -39,9 +47,9 @@ class AudioManager:
             self.logger.info("pygame音频初始化成功")
         except (ImportError, Exception) as e:
             self.pygame_available = False
-            self.logger.warning(f"pygame音频初始化失败: {e}")
+            self.logger.warning("pygame音频初始化失败: %s", e)
             
-        self.logger.info(f"使用音频后端: {AUDIO_BACKEND}")
+        self.logger.info("使用音频后端: %s", AUDIO_BACKEND)
     
     def play_sound(self, sound_file: str, loop: bool = False) -> bool:
         """播放音频文件
@@ -53,8 +61,8 @@ class AudioManager:
         Returns:
             是否成功开始播放
         """
-        if not sound_file or not os.path.exists(sound_file):
-            self.logger.warning(f"音频文件不存在: {sound_file}")
+        if not sound_file or not self._sound_file_exists(sound_file):
+            self.logger.warning("音频文件不存在: %s", sound_file)
             return False
             
         # 停止当前播放的音频
@@ -62,15 +70,34 @@ class AudioManager:
         
         try:
             if AUDIO_BACKEND == "pygame":
-                return self._play_with_pygame(sound_file, loop)
+                success = self._play_with_pygame(sound_file, loop)
             elif AUDIO_BACKEND == "winsound":
-                return self._play_with_winsound(sound_file, loop)
+                success = self._play_with_winsound(sound_file, loop)
             else:
                 self.logger.warning("没有可用的音频后端")
                 return False
         except Exception as e:
-            self.logger.error(f"播放音频失败: {e}")
-            return False
+            self.logger.error("播放音频失败: %s", e)
+            success = False
+
+        # 播放失败时文件可能已被删除，下次重新检查
+        if not success:
+            self._exists_cache.pop(sound_file, None)
+        return success
+
+    def _sound_file_exists(self, sound_file: str) -> bool:
+        """检查音频文件是否存在，短时间内重复检查同一文件时直接使用缓存结果"""
+        now = time.monotonic()
+        checked_at = self._exists_cache.get(sound_file)
+        if checked_at is not None and now - checked_at < EXISTS_CACHE_TTL:
+            return True
+
+        if os.path.exists(sound_file):
+            self._exists_cache[sound_file] = now
+            return True
+
+        self._exists_cache.pop(sound_file, None)
+        return False
     
     def _play_with_pygame(self, sound_file: str, loop: bool) -> bool:
         """使用pygame播放音频"""
@@ -81,7 +108,7 @@ class AudioManager:
             self.is_playing = True
             return True
         except Exception as e:
-            self.logger.error(f"pygame播放失败: {e}")
+            self.logger.error("pygame播放失败: %s", e)
             return False
     
     def _play_with_winsound(self, sound_file: str, loop: bool) -> bool:
@@ -107,7 +134,7 @@ class AudioManager:
                                 pygame.mixer.music.load(sound_file)
                                 loop_count = -1 if loop else 0  # -1表示无限循环
                                 pygame.mixer.music.play(loop_count)
-                                self.logger.info(f"使用pygame播放非wav文件: {sound_file}")
+                                self.logger.info("使用pygame播放非wav文件: %s", sound_file)
                                 
                                 # 等待停止信号或播放结束
                                 while pygame.mixer.music.get_busy() and not self.stop_event.is_set():
@@ -120,22 +147,22 @@ class AudioManager:
                                     
                                 return  # 播放完成或被停止，退出线程
                             except Exception as e:
-                                self.logger.error(f"使用pygame播放非wav文件失败: {e}")
+                                self.logger.error("使用pygame播放非wav文件失败: %s", e)
                                 # 如果pygame播放失败，尝试使用系统提示音
                                 winsound.MessageBeep()
                         else:
                             # pygame不可用，使用系统提示音
-                            self.logger.warning(f"无法播放非wav文件: {sound_file}，pygame不可用")
+                            self.logger.warning("无法播放非wav文件: %s，pygame不可用", sound_file)
                             winsound.MessageBeep()
                 except Exception as e:
-                    self.logger.error(f"winsound播放线程错误: {e}")
+                    self.logger.error("winsound播放线程错误: %s", e)
                 finally:
                     self.is_playing = False
             
             threading.Thread(target=play_thread, daemon=True).start()
             return True
         except Exception as e:
-            self.logger.error(f"winsound播放失败: {e}")
+            self.logger.error("winsound播放失败: %s", e)
             self.is_playing = False
             return False
     
@@ -153,7 +180,7 @@ class AudioManager:
                         pygame.mixer.music.stop()
                         self.logger.info("pygame音频播放已停止")
                 except (ImportError, AttributeError) as e:
-                    self.logger.error(f"停止pygame音频失败: {e}")
+                    self.logger.error("停止pygame音频失败: %s", e)
             
             # 停止winsound播放
             if AUDIO_BACKEND == "winsound":
@@ -163,7 +190,7 @@ class AudioManager:
             self.is_playing = False
             self.logger.info("音频播放已停止")
         except Exception as e:
-            self.logger.error(f"停止音频失败: {e}")
+            self.logger.error("停止音频失败: %s", e)
     
     def is_sound_playing(self) -> bool:
         """检查是否正在播放音频"""
@@ -194,13 +221,13 @@ class AudioManager:
                         self.logger.info("pygame音频播放已暂停")
                         return  # 成功暂停，直接返回
                 except (ImportError, AttributeError) as e:
-                    self.logger.error(f"暂停pygame音频失败: {e}")
+                    self.logger.error("暂停pygame音频失败: %s", e)
             
             # 对于winsound或其他后端，使用停止功能
             self.stop_sound()
             self.logger.info("音频播放已暂停")
         except Exception as e:
-            self.logger.error(f"暂停音频失败: {e}")
+            self.logger.error("暂停音频失败: %s", e)
     
     def unpause_sound(self):
         """恢复暂停的音频播放"""
@@ -217,10 +244,10 @@ class AudioManager:
                         self.logger.info("pygame音频播放已恢复")
                         return  # 成功恢复，直接返回
                 except (ImportError, AttributeError) as e:
-                    self.logger.error(f"恢复pygame音频失败: {e}")
+                    self.logger.error("恢复pygame音频失败: %s", e)
             
             # 对于winsound或其他后端，可能需要重新开始播放
             # 这里我们简单地记录日志，因为winsound不支持真正的暂停/恢复
             self.logger.info("音频播放已恢复")
         except Exception as e:
-            self.logger.error(f"恢复音频失败: {e}")
\ No newline at end of file
+            self.logger.error("恢复音频失败: %s", e)
\ No newline at end of file
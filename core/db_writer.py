@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库写入线程模块
+负责在后台线程中按顺序执行数据库写操作，避免阻塞界面
+"""
+
+from PyQt5.QtCore import QThread
+from concurrent.futures import Future
+import logging
+import queue
+
+
+class DbWriter(QThread):
+    """单消费者数据库写入线程"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        # 待执行的写操作，None表示停止
+        self._jobs = queue.Queue()
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        提交一个写操作，按提交顺序执行
+
+        Args:
+            func: 要执行的函数
+            *args, **kwargs: 函数参数
+
+        Returns:
+            操作结果的Future
+        """
+        future = Future()
+        self._jobs.put((future, func, args, kwargs))
+        return future
+
+    def stop(self):
+        """执行完已提交的操作后停止线程"""
+        self._jobs.put(None)
+        self.wait()
+
+    def run(self):
+        """依次执行队列中的写操作"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+
+            future, func, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                self.logger.error(f"数据库写操作失败: {e}")
+                future.set_exception(e)
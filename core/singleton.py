@@ -17,8 +17,6 @@ import win32event
 import win32api
 import winerror
 import ctypes
-from PyQt5.QtCore import QTimer
-from PyQt5.QtWidgets import QApplication
 
 # 定义Windows消息常量
 WM_SHOWAPP = win32con.WM_USER + 1
@@ -31,6 +29,8 @@ class SingletonApp:
     
     使用命名互斥锁和文件锁实现单例检测，更可靠且适用于Windows环境。
     """
+
+    __slots__ = ('app_id', 'mutex_name', 'mutex', 'hwnd', 'logger', 'check_timer')
     
     def __init__(self, app_id="FocusTimer.SingleInstance"):
         """
@@ -99,10 +99,18 @@ class SingletonApp:
                 
                 # 如果找不到窗口，可能是因为窗口还没有创建完成
                 # 或者窗口被隐藏了，我们可以尝试多次查找
-                if not self.check_timer and QApplication.instance():
-                    self.check_timer = QTimer()
-                    self.check_timer.timeout.connect(self._check_window_exists)
-                    self.check_timer.start(500)  # 每500毫秒检查一次
+                # Qt只在已创建应用程序时才需要，单例检查阶段不为此导入Qt
+                qt_widgets = sys.modules.get("PyQt5.QtWidgets")
+                if (qt_widgets and qt_widgets.QApplication.instance()
+                        and not (self.check_timer and self.check_timer.isActive())):
+                    from PyQt5.QtCore import QTimer
+                    
+                    # 定时器只创建一次，之后重复使用
+                    if self.check_timer is None:
+                        self.check_timer = QTimer()
+                        self.check_timer.timeout.connect(self._check_window_exists)
+                        self.check_timer.setInterval(500)  # 每500毫秒检查一次
+                    self.check_timer.start()
                     self.logger.info("启动窗口检查定时器")
                     
                     # 5秒后停止检查
@@ -139,9 +147,8 @@ class SingletonApp:
         """
         停止窗口检查定时器
         """
-        if self.check_timer:
+        if self.check_timer and self.check_timer.isActive():
             self.check_timer.stop()
-            self.check_timer = None
             self.logger.info("停止窗口检查定时器")
     
     def register_window_class(self, window_instance):
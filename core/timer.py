@@ -5,12 +5,15 @@
 负责计时器的核心逻辑和状态管理
 """
 
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, pyqtSignal
 from enum import Enum
 from datetime import datetime
 import logging
 from typing import Optional
 
+# 定时器滴答间隔（毫秒），时间信号仍然只在整秒变化时发送
+TICK_INTERVAL_MS = 200
+
 
 class TimerState(Enum):
     """计时器状态枚举"""
@@ -23,6 +26,11 @@ class TimerState(Enum):
 class FocusTimer(QObject):
     """专注计时器类"""
 
+    __slots__ = ('logger', '_state', '_timer_type', '_total_duration', '_remaining_time',
+                 '_elapsed_time', '_session_id', '_start_time', '_pause_time',
+                 '_total_pause_duration', '_qt_timer', '_elapsed', '_paused_ms',
+                 '_paused_at_ms', '_last_int_sec')
+
     # 信号定义
     state_changed = pyqtSignal(TimerState)  # 状态变化信号
     time_updated = pyqtSignal(int, int)  # 时间更新信号 (剩余时间, 总时间)
@@ -47,10 +55,16 @@ class FocusTimer(QObject):
         self._pause_time = None
         self._total_pause_duration = 0  # 总暂停时长
 
+        # 计时基准：单调时钟，扣除暂停的毫秒数后得到实际运行时长
+        self._elapsed = QElapsedTimer()
+        self._paused_ms = 0
+        self._paused_at_ms = 0
+        self._last_int_sec = 0
+
         # Qt定时器
         self._qt_timer = QTimer()
         self._qt_timer.timeout.connect(self._on_timer_tick)
-        self._qt_timer.setInterval(1000)  # 1秒间隔
+        self._qt_timer.setInterval(TICK_INTERVAL_MS)
 
         self.logger.info("计时器核心初始化完成")
 
@@ -128,14 +142,17 @@ class FocusTimer(QObject):
         self._start_time = datetime.now()
         self._pause_time = None
         self._total_pause_duration = 0
+        self._paused_ms = 0
+        self._last_int_sec = 0
 
+        self._elapsed.start()
         self._set_state(TimerState.RUNNING)
         self._qt_timer.start()
 
         # 发送初始信号
         self._emit_time_signals()
 
-        self.logger.info(f"计时器开始: 类型={timer_type}, 时长={duration}秒, 会话ID={session_id}")
+        self.logger.info("计时器开始: 类型=%s, 时长=%s秒, 会话ID=%s", timer_type, duration, session_id)
         return True
 
     def pause(self):
@@ -146,6 +163,7 @@ class FocusTimer(QObject):
 
         self._qt_timer.stop()
         self._pause_time = datetime.now()
+        self._paused_at_ms = self._elapsed.elapsed()
         self._set_state(TimerState.PAUSED)
 
         self.logger.info("计时器已暂停")
@@ -163,6 +181,7 @@ class FocusTimer(QObject):
             self._total_pause_duration += pause_duration
             self._pause_time = None
 
+        self._paused_ms += self._elapsed.elapsed() - self._paused_at_ms
         self._qt_timer.start()
         self._set_state(TimerState.RUNNING)
 
@@ -194,8 +213,8 @@ class FocusTimer(QObject):
         # 发送完成信号
         self.timer_finished.emit(self._timer_type, actual_duration, completed)
 
-        self.logger.info(f"计时器停止: 类型={self._timer_type}, 实际时长={actual_duration}秒, "
-                         f"完成={completed}, 暂停时长={self._total_pause_duration}秒")
+        self.logger.info("计时器停止: 类型=%s, 实际时长=%s秒, 完成=%s, 暂停时长=%s秒",
+                         self._timer_type, actual_duration, completed, self._total_pause_duration)
 
         # 重置状态
         if not completed:
@@ -230,8 +249,7 @@ class FocusTimer(QObject):
 
         self._emit_time_signals()
 
-        self.logger.info(f"调整时间: {'+' if seconds >= 0 else ''}{seconds}秒, "
-                         f"剩余时间: {self._remaining_time}秒")
+        self.logger.info("调整时间: %+d秒, 剩余时间: %s秒", seconds, self._remaining_time)
         return True
 
     def get_time_info(self) -> dict:
@@ -253,8 +271,17 @@ class FocusTimer(QObject):
         if self._state != TimerState.RUNNING:
             return
 
-        self._remaining_time -= 1
-        self._elapsed_time += 1
+        # 只有整秒数变化时才更新状态并发送信号
+        current_sec = (self._elapsed.elapsed() - self._paused_ms) // 1000
+        passed = current_sec - self._last_int_sec
+        if passed <= 0:
+            return
+        self._last_int_sec = current_sec
+
+        # 卡顿或系统休眠后经过的时间可能超过剩余时间，实际时长不应超过计划时长
+        passed = min(passed, self._remaining_time)
+        self._remaining_time -= passed
+        self._elapsed_time += passed
 
         # 发送更新信号
         self._emit_time_signals()
@@ -274,7 +301,8 @@ class FocusTimer(QObject):
             old_state = self._state
             self._state = new_state
             self.state_changed.emit(new_state)
-            self.logger.debug(f"状态变化: {old_state} -> {new_state}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("状态变化: %s -> %s", old_state, new_state)
 
     def _reset_state(self):
         """重置状态"""
@@ -286,6 +314,10 @@ class FocusTimer(QObject):
         self._start_time = None
         self._pause_time = None
         self._total_pause_duration = 0
+        self._paused_ms = 0
+        self._paused_at_ms = 0
+        self._last_int_sec = 0
+        self._elapsed.invalidate()
 
     def format_time(self, seconds: int, show_seconds: bool = True) -> str:
         """
@@ -328,6 +360,8 @@ class FocusTimer(QObject):
 class TimerManager(QObject):
     """计时器管理器"""
 
+    __slots__ = ('database', 'logger', 'timer')
+
     # 信号定义
     timer_started = pyqtSignal(str, int)  # 计时器开始 (类型, 时长)
     timer_paused = pyqtSignal()  # 计时器暂停
@@ -372,7 +406,7 @@ class TimerManager(QObject):
             try:
                 session_id = self.database.start_session(timer_type, duration)
             except Exception as e:
-                self.logger.error(f"创建数据库会话失败: {e}")
+                self.logger.error("创建数据库会话失败: %s", e)
 
         # 开始计时器
         if self.timer.start(timer_type, duration, session_id):
@@ -408,7 +442,7 @@ class TimerManager(QObject):
 
     def _on_state_changed(self, new_state: TimerState):
         """状态变化处理"""
-        self.logger.debug(f"计时器状态变化: {new_state}")
+        self.logger.debug("计时器状态变化: %s", new_state)
 
     def _on_timer_finished(self, timer_type: str, actual_duration: int, completed: bool):
         """计时器完成处理"""
@@ -421,7 +455,7 @@ class TimerManager(QObject):
                     notes=""
                 )
             except Exception as e:
-                self.logger.error(f"更新数据库会话失败: {e}")
+                self.logger.error("更新数据库会话失败: %s", e)
 
         # 发送完成信号
         if completed:
@@ -25,23 +25,23 @@ if not os.path.exists(sound_path):
     frequency = 440.0    # 频率（赫兹）
     volume = 0.5         # 音量（0.0-1.0）
     
+    n_frames = int(sample_rate * duration)
+    
     # 创建WAV文件
     with wave.open(sound_path, 'w') as wav_file:
         # 设置参数
-        wav_file.setparams((1, 2, sample_rate, int(sample_rate * duration), 'NONE', 'not compressed'))
+        wav_file.setparams((1, 2, sample_rate, n_frames, 'NONE', 'not compressed'))
         
-        # 生成音频数据
-        values = []
-        for i in range(int(sample_rate * duration)):
-            # 生成正弦波
-            value = int(volume * 32767.0 * math.sin(2.0 * math.pi * frequency * i / sample_rate))
-            # 打包为二进制数据
-            packed_value = struct.pack('h', value)
-            values.append(packed_value)
+        # 生成音频数据，直接写入预分配的缓冲区
+        buf = bytearray(n_frames * 2)
+        step = 2.0 * math.pi * frequency / sample_rate
+        amplitude = volume * 32767.0
+        for i in range(n_frames):
+            # 生成正弦波并打包为16位小端整数
+            struct.pack_into('<h', buf, i * 2, int(amplitude * math.sin(step * i)))
         
         # 写入WAV文件
-        value_str = b''.join(values)
-        wav_file.writeframes(value_str)
+        wav_file.writeframes(buf)
     
     print(f"创建默认提示音: {sound_path}")
 else:
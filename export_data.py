@@ -5,20 +5,66 @@
 用于导出数据库中的所有数据
 """
 
+import argparse
 import json
 import os
+import shutil
 import sys
-from datetime import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import partial
 from config.database import Database
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def export_data(export_file_path=None):
+# 各表的导出列，按输出顺序排列
+EXPORT_QUERIES = (
+    ("study_sessions", '''
+        id, date, start_time, end_time, timer_type, planned_duration, 
+        actual_duration, completed, notes, todo_id, todo_content, created_at
+    '''),
+    ("todo_items", '''
+        id, content, date, completed, created_at, completed_at, priority
+    '''),
+    ("daily_stats", '''
+        id, date, total_study_time, total_rest_time, session_count, 
+        completion_rate, updated_at
+    '''),
+    ("timer_type_stats", '''
+        id, timer_type, date, usage_count, total_time
+    '''),
+)
+
+# 可导出的表名
+EXPORT_TABLES = tuple(table for table, _ in EXPORT_QUERIES)
+
+# 并行导出的线程数（每张表一个）
+EXPORT_WORKERS = len(EXPORT_QUERIES)
+
+# 未安装orjson时使用的编码器，只创建一次
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def export_data(export_file_path=None, db=None, tables=None, since=None, until=None):
     """
     导出数据库中的所有数据
     
     Args:
         export_file_path: 导出文件路径，默认为data_export_YYYYMMDD_HHMMSS.json
+        db: 数据库对象，默认新建；由调用方传入时只使用其数据库文件路径（各表在新开的只读连接上导出，
+            因此调用方连接中未提交的修改不会被导出），且不关闭
+        tables: 要导出的表名列表，默认全部；未选中的表输出为空数组
+        since: 起始日期（含），只导出date不早于该日期的记录
+        until: 结束日期（含），只导出date不晚于该日期的记录
     """
+    if tables is None:
+        tables = EXPORT_TABLES
+    
     if export_file_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         export_file_path = f"data_export_{timestamp}.json"
@@ -28,70 +74,51 @@ def export_data(export_file_path=None):
     if export_dir and not os.path.exists(export_dir):
         os.makedirs(export_dir, exist_ok=True)
     
-    # 初始化数据库
-    db = Database()
+    # 初始化数据库（未传入时才新建，并在结束时关闭）
+    owns_db = db is None
+    if owns_db:
+        db = Database()
+    
+    # 各表的临时片段文件
+    fragments = {}
     
     try:
-        # 导出数据
-        export_data = {
-            "export_timestamp": datetime.now().isoformat(),
-            "study_sessions": [],
-            "todo_items": [],
-            "daily_stats": [],
-            "timer_type_stats": []
-        }
-        
-        # 获取数据库连接
-        conn = db._get_connection()
-        cursor = conn.cursor()
-        
-        # 导出学习会话数据
-        cursor.execute('''
-            SELECT id, date, start_time, end_time, timer_type, planned_duration, 
-                   actual_duration, completed, notes, todo_id, todo_content, created_at
-            FROM study_sessions
-            ORDER BY date DESC, start_time DESC
-        ''')
-        study_sessions = cursor.fetchall()
-        export_data["study_sessions"] = [dict(row) for row in study_sessions]
-        
-        # 导出TODO项目数据
-        cursor.execute('''
-            SELECT id, content, date, completed, created_at, completed_at, priority
-            FROM todo_items
-            ORDER BY date DESC, priority DESC, created_at DESC
-        ''')
-        todo_items = cursor.fetchall()
-        export_data["todo_items"] = [dict(row) for row in todo_items]
-        
-        # 导出每日统计数据
-        cursor.execute('''
-            SELECT id, date, total_study_time, total_rest_time, session_count, 
-                   completion_rate, updated_at
-            FROM daily_stats
-            ORDER BY date DESC
-        ''')
-        daily_stats = cursor.fetchall()
-        export_data["daily_stats"] = [dict(row) for row in daily_stats]
+        fragment_dir = export_dir or "."
+        selected = [(table, columns) for table, columns in EXPORT_QUERIES if table in tables]
+        for table, _ in selected:
+            fd, fragments[table] = tempfile.mkstemp(suffix=".part", dir=fragment_dir)
+            os.close(fd)
         
-        # 导出计时器类型统计数据
-        cursor.execute('''
-            SELECT id, timer_type, date, usage_count, total_time
-            FROM timer_type_stats
-            ORDER BY date DESC, timer_type
-        ''')
-        timer_type_stats = cursor.fetchall()
-        export_data["timer_type_stats"] = [dict(row) for row in timer_type_stats]
+        # 每张表由独立的只读连接在各自线程中导出为JSON数组片段
+        counts = dict.fromkeys(EXPORT_TABLES, 0)
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+            futures = {
+                table: executor.submit(
+                    _dump_table, db, *_build_query(table, columns, since, until), fragments[table]
+                )
+                for table, columns in selected
+            }
+            counts.update((table, future.result()) for table, future in futures.items())
         
-        # 将数据写入文件
-        with open(export_file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2, default=str)
+        # 按顺序将片段拼接到外层对象中
+        with open(export_file_path, 'wb') as f:
+            f.write(b'{\n  "export_timestamp": ')
+            f.write(_encode_value(datetime.now().isoformat()))
+            for table in EXPORT_TABLES:
+                f.write(f',\n  "{table}": '.encode("utf-8"))
+                if table not in fragments:
+                    # 未选中的表保留键名，便于导入时统一处理
+                    f.write(b'[]')
+                    continue
+                with open(fragments[table], 'rb') as fragment:
+                    shutil.copyfileobj(fragment, f)
+            f.write(b'\n}\n')
         
         print(f"数据导出成功！共导出:")
-        print(f"  - 学习会话: {len(export_data['study_sessions'])} 条")
-        print(f"  - TODO项目: {len(export_data['todo_items'])} 条")
-        print(f"  - 每日统计: {len(export_data['daily_stats'])} 条")
-        print(f"  - 计时器统计: {len(export_data['timer_type_stats'])} 条")
+        print(f"  - 学习会话: {counts['study_sessions']} 条")
+        print(f"  - TODO项目: {counts['todo_items']} 条")
+        print(f"  - 每日统计: {counts['daily_stats']} 条")
+        print(f"  - 计时器统计: {counts['timer_type_stats']} 条")
         print(f"导出文件: {export_file_path}")
         
         return True
@@ -100,21 +127,130 @@ def export_data(export_file_path=None):
         print(f"数据导出失败: {e}")
         return False
     finally:
-        # 关闭数据库连接
-        if db:
+        # 清理临时片段文件
+        for fragment_path in fragments.values():
+            if os.path.exists(fragment_path):
+                os.remove(fragment_path)
+        # 关闭自行创建的数据库连接
+        if owns_db:
             db.close()
 
 
+def _build_query(table, columns, since=None, until=None):
+    """
+    生成一张表的导出查询，日期范围条件走date列上的索引
+    
+    Args:
+        table: 表名
+        columns: 导出列
+        since: 起始日期（含）
+        until: 结束日期（含）
+        
+    Returns:
+        (查询语句, 参数列表)
+    """
+    conditions = []
+    params = []
+    if since is not None:
+        conditions.append("date >= ?")
+        params.append(str(since))
+    if until is not None:
+        conditions.append("date <= ?")
+        params.append(str(until))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT {columns} FROM {table} {where} ORDER BY id", params
+
+
+def _dump_table(db, sql, params, fragment_path):
+    """
+    在独立的只读连接上导出一张表到片段文件
+    
+    Args:
+        db: 数据库对象
+        sql: 查询语句
+        params: 查询参数
+        fragment_path: 片段文件路径
+        
+    Returns:
+        写入的记录数
+    """
+    conn = db.open_readonly_connection()
+    try:
+        with open(fragment_path, 'wb') as f:
+            return _stream_array(f, conn.cursor(), sql, params)
+    finally:
+        conn.close()
+
+
+def _json_encode_value(value):
+    """
+    使用标准库json将单个值编码为JSON（UTF-8字节串）
+    
+    Args:
+        value: 要编码的值
+        
+    Returns:
+        编码后的字节串
+    """
+    return _JSON_ENCODER.encode(value).encode("utf-8")
+
+
+# 单个值的JSON编码函数：安装了orjson时直接使用其C实现，省去每个值一层Python调用
+if ORJSON_AVAILABLE:
+    _encode_value = partial(orjson.dumps, default=str)
+else:
+    _encode_value = _json_encode_value
+
+
+def _stream_array(f, cursor, sql, params):
+    """
+    执行查询并将结果逐行写成JSON数组
+    
+    Args:
+        f: 以二进制模式打开的输出文件
+        cursor: 数据库游标
+        sql: 查询语句
+        params: 查询参数
+        
+    Returns:
+        写入的记录数
+    """
+    count = 0
+    f.write(b'[')
+    cursor.execute(sql, params)
+    # 列名只编码一次，每行直接由元组拼接键前缀和值，不构造字典
+    key_prefixes = tuple(_encode_value(column[0]) + b": " for column in cursor.description)
+    join_fields = b", ".join
+    # 直接迭代游标，由sqlite逐行返回结果
+    for row in cursor:
+        f.write(b',\n    {' if count else b'\n    {')
+        f.write(join_fields(map(bytes.__add__, key_prefixes, map(_encode_value, row))))
+        f.write(b'}')
+        count += 1
+    f.write(b'\n  ]' if count else b']')
+    return count
+
+
 def main():
     """主函数"""
     # 解析命令行参数
-    export_file_path = None
-    if len(sys.argv) > 1:
-        export_file_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="导出数据库中的数据为JSON")
+    parser.add_argument("export_file", nargs="?", help="导出文件路径（同--out）")
+    parser.add_argument("-o", "--out", help="导出文件路径，默认为data_export_YYYYMMDD_HHMMSS.json")
+    parser.add_argument("--tables", nargs="+", choices=EXPORT_TABLES, default=list(EXPORT_TABLES),
+                        help="要导出的表，默认全部")
+    parser.add_argument("--since", type=date.fromisoformat, help="起始日期（含），格式YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="结束日期（含），格式YYYY-MM-DD")
+    args = parser.parse_args()
     
-    success = export_data(export_file_path)
+    success = export_data(
+        args.out or args.export_file,
+        tables=args.tables,
+        since=args.since,
+        until=args.until
+    )
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,19 +5,40 @@ SQL数据导出脚本
 用于导出数据库中的所有数据为SQL格式
 """
 
+import argparse
+import mmap
 import os
+import shutil
 import sys
-from datetime import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from config.database import Database
 
+# 需要导出的数据表
+EXPORT_TABLES = ("study_sessions", "todo_items", "daily_stats", "timer_type_stats")
 
-def export_sql(export_file_path=None):
+# 并行导出的线程数（每张表一个）
+EXPORT_WORKERS = len(EXPORT_TABLES)
+
+# 每次从游标取出并写入的INSERT语句条数
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_sql(export_file_path=None, db=None, tables=None, since=None, until=None):
     """
     导出数据库中的所有数据为SQL格式
     
     Args:
         export_file_path: 导出文件路径，默认为data_export_YYYYMMDD_HHMMSS.sql
+        db: 数据库对象，默认新建；由调用方传入时只使用其数据库文件路径（各表在新开的只读连接上导出，
+            因此调用方连接中未提交的修改不会被导出），且不关闭
+        tables: 要导出的表名列表，默认全部；脚本只删除并重建选中的表
+        since: 起始日期（含），只导出date不早于该日期的记录
+        until: 结束日期（含），只导出date不晚于该日期的记录
     """
+    tables = [table for table in EXPORT_TABLES if tables is None or table in tables]
+    
     if export_file_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         export_file_path = f"data_export_{timestamp}.sql"
@@ -27,184 +48,64 @@ def export_sql(export_file_path=None):
     if export_dir and not os.path.exists(export_dir):
         os.makedirs(export_dir, exist_ok=True)
     
-    # 初始化数据库
-    db = Database()
+    # 初始化数据库（未传入时才新建，并在结束时关闭）
+    owns_db = db is None
+    if owns_db:
+        db = Database()
+    
+    # 各表的临时片段文件
+    fragments = {}
     
     try:
-        # 打开文件准备写入
-        with open(export_file_path, 'w', encoding='utf-8') as f:
-            # 写入SQL文件头部信息
-            f.write("-- 数据导出SQL脚本\n")
-            f.write(f"-- 导出时间: {datetime.now().isoformat()}\n")
-            f.write("-- 该脚本可用于恢复数据\n\n")
-            
-            # 获取数据库连接
-            conn = db._get_connection()
-            cursor = conn.cursor()
-            
-            # 导出表结构
-            f.write("-- 表结构定义\n")
-            f.write("DROP TABLE IF EXISTS study_sessions;\n")
-            f.write("""CREATE TABLE study_sessions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    date DATE NOT NULL,
-    start_time DATETIME NOT NULL,
-    end_time DATETIME,
-    timer_type TEXT NOT NULL,
-    planned_duration INTEGER NOT NULL,
-    actual_duration INTEGER,
-    completed BOOLEAN DEFAULT FALSE,
-    notes TEXT,
-    todo_id INTEGER,
-    todo_content TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);\n""")
-            f.write("\n")
-            
-            f.write("DROP TABLE IF EXISTS daily_stats;\n")
-            f.write("""CREATE TABLE daily_stats (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    date DATE UNIQUE NOT NULL,
-    total_study_time INTEGER DEFAULT 0,
-    total_rest_time INTEGER DEFAULT 0,
-    session_count INTEGER DEFAULT 0,
-    completion_rate REAL DEFAULT 0.0,
-    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);\n""")
-            f.write("\n")
-            
-            f.write("DROP TABLE IF EXISTS timer_type_stats;\n")
-            f.write("""CREATE TABLE timer_type_stats (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timer_type TEXT NOT NULL,
-    date DATE NOT NULL,
-    usage_count INTEGER DEFAULT 0,
-    total_time INTEGER DEFAULT 0,
-    UNIQUE(timer_type, date)
-);\n""")
-            f.write("\n")
-            
-            f.write("DROP TABLE IF EXISTS todo_items;\n")
-            f.write("""CREATE TABLE todo_items (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    content TEXT NOT NULL,
-    date DATE NOT NULL,
-    completed BOOLEAN DEFAULT FALSE,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    completed_at DATETIME,
-    priority INTEGER DEFAULT 0
-);\n""")
-            f.write("\n")
-            
-            # 导出学习会话数据
-            f.write("-- 学习会话数据\n")
-            f.write("DELETE FROM study_sessions;\n")
-            cursor.execute('''
-                SELECT id, date, start_time, end_time, timer_type, planned_duration, 
-                       actual_duration, completed, notes, todo_id, todo_content, created_at
-                FROM study_sessions
-                ORDER BY date DESC, start_time DESC
-            ''')
-            study_sessions = cursor.fetchall()
-            for session in study_sessions:
-                # 处理None值
-                values = []
-                for value in session:
-                    if value is None:
-                        values.append("NULL")
-                    elif isinstance(value, str):
-                        # 转义单引号
-                        escaped_value = value.replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                    else:
-                        values.append(str(value))
-                
-                f.write(f"INSERT INTO study_sessions (id, date, start_time, end_time, timer_type, planned_duration, actual_duration, completed, notes, todo_id, todo_content, created_at) VALUES ({', '.join(values)});\n")
-            f.write(f"-- 共导出 {len(study_sessions)} 条学习会话记录\n\n")
-            
-            # 导出TODO项目数据
-            f.write("-- TODO项目数据\n")
-            f.write("DELETE FROM todo_items;\n")
-            cursor.execute('''
-                SELECT id, content, date, completed, created_at, completed_at, priority
-                FROM todo_items
-                ORDER BY date DESC, priority DESC, created_at DESC
-            ''')
-            todo_items = cursor.fetchall()
-            for todo in todo_items:
-                # 处理None值
-                values = []
-                for value in todo:
-                    if value is None:
-                        values.append("NULL")
-                    elif isinstance(value, str):
-                        # 转义单引号
-                        escaped_value = value.replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                    else:
-                        values.append(str(value))
-                
-                f.write(f"INSERT INTO todo_items (id, content, date, completed, created_at, completed_at, priority) VALUES ({', '.join(values)});\n")
-            f.write(f"-- 共导出 {len(todo_items)} 条TODO项目记录\n\n")
-            
-            # 导出每日统计数据
-            f.write("-- 每日统计数据\n")
-            f.write("DELETE FROM daily_stats;\n")
-            cursor.execute('''
-                SELECT id, date, total_study_time, total_rest_time, session_count, 
-                       completion_rate, updated_at
-                FROM daily_stats
-                ORDER BY date DESC
-            ''')
-            daily_stats = cursor.fetchall()
-            for stat in daily_stats:
-                # 处理None值
-                values = []
-                for value in stat:
-                    if value is None:
-                        values.append("NULL")
-                    elif isinstance(value, str):
-                        # 转义单引号
-                        escaped_value = value.replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                    else:
-                        values.append(str(value))
-                
-                f.write(f"INSERT INTO daily_stats (id, date, total_study_time, total_rest_time, session_count, completion_rate, updated_at) VALUES ({', '.join(values)});\n")
-            f.write(f"-- 共导出 {len(daily_stats)} 条每日统计记录\n\n")
-            
-            # 导出计时器类型统计数据
-            f.write("-- 计时器类型统计数据\n")
-            f.write("DELETE FROM timer_type_stats;\n")
-            cursor.execute('''
-                SELECT id, timer_type, date, usage_count, total_time
-                FROM timer_type_stats
-                ORDER BY date DESC, timer_type
-            ''')
-            timer_type_stats = cursor.fetchall()
-            for stat in timer_type_stats:
-                # 处理None值
-                values = []
-                for value in stat:
-                    if value is None:
-                        values.append("NULL")
-                    elif isinstance(value, str):
-                        # 转义单引号
-                        escaped_value = value.replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                    else:
-                        values.append(str(value))
-                
-                f.write(f"INSERT INTO timer_type_stats (id, timer_type, date, usage_count, total_time) VALUES ({', '.join(values)});\n")
-            f.write(f"-- 共导出 {len(timer_type_stats)} 条计时器类型统计记录\n\n")
+        fragment_dir = export_dir or "."
+        for table in tables:
+            fd, fragments[table] = tempfile.mkstemp(suffix=".part", dir=fragment_dir)
+            os.close(fd)
+        
+        # 每张表由独立的只读连接在各自线程中生成建表和INSERT语句
+        counts = dict.fromkeys(EXPORT_TABLES, 0)
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+            futures = {
+                table: executor.submit(_dump_table, db, table, fragments[table], since, until)
+                for table in tables
+            }
+            counts.update((table, future.result()) for table, future in futures.items())
+        
+        # SQL文件头部信息，先删除旧表，再按顺序拼接各表的片段
+        head = [
+            "-- 数据导出SQL脚本\n",
+            f"-- 导出时间: {datetime.now().isoformat()}\n",
+            "-- 该脚本可用于恢复数据\n\n",
+            "-- 表结构与数据\n",
+        ]
+        head.extend(f"DROP TABLE IF EXISTS {table};\n" for table in tables)
+        head.append("\nBEGIN TRANSACTION;\n")
+        
+        # 恢复所导出表的自增序列
+        conn = db._get_connection()
+        table_names = ", ".join(f"'{table}'" for table in tables)
+        tail = [f'DELETE FROM "sqlite_sequence" WHERE name IN ({table_names});\n']
+        for (line,) in conn.execute(f'''
+            SELECT 'INSERT INTO "sqlite_sequence" VALUES(' || quote(name) || ',' || quote(seq) || ');'
+            FROM sqlite_sequence WHERE name IN ({table_names})
+        '''):
+            tail.append(f"{line}\n")
+        tail.append("COMMIT;\n")
+        
+        _write_output(
+            export_file_path,
+            "".join(head).encode("utf-8"),
+            [fragments[table] for table in tables],
+            "".join(tail).encode("utf-8")
+        )
         
         print(f"SQL数据导出成功！")
         print(f"导出文件: {export_file_path}")
         print(f"导出记录:")
-        print(f"  - 学习会话: {len(study_sessions)} 条")
-        print(f"  - TODO项目: {len(todo_items)} 条")
-        print(f"  - 每日统计: {len(daily_stats)} 条")
-        print(f"  - 计时器统计: {len(timer_type_stats)} 条")
+        print(f"  - 学习会话: {counts['study_sessions']} 条")
+        print(f"  - TODO项目: {counts['todo_items']} 条")
+        print(f"  - 每日统计: {counts['daily_stats']} 条")
+        print(f"  - 计时器统计: {counts['timer_type_stats']} 条")
         
         return True
         
@@ -212,21 +113,134 @@ def export_sql(export_file_path=None):
         print(f"SQL数据导出失败: {e}")
         return False
     finally:
-        # 关闭数据库连接
-        if db:
+        # 清理临时片段文件
+        for fragment_path in fragments.values():
+            if os.path.exists(fragment_path):
+                os.remove(fragment_path)
+        # 关闭自行创建的数据库连接
+        if owns_db:
             db.close()
 
 
+def _write_output(export_file_path, head, fragment_paths, tail):
+    """
+    将头部、各表片段和尾部写入导出文件
+    
+    片段大小已知，文件按最终大小预分配后通过内存映射写入，
+    片段内容直接读入映射区域，不经过Python的文件缓冲。
+    
+    Args:
+        export_file_path: 导出文件路径
+        head: 头部字节串
+        fragment_paths: 片段文件路径列表
+        tail: 尾部字节串
+    """
+    if os.name == "nt":
+        # Windows上映射中的文件无法调整大小，退回顺序写入
+        with open(export_file_path, 'wb') as f:
+            f.write(head)
+            for fragment_path in fragment_paths:
+                with open(fragment_path, 'rb') as fragment:
+                    shutil.copyfileobj(fragment, f)
+            f.write(tail)
+        return
+    
+    sizes = [os.path.getsize(fragment_path) for fragment_path in fragment_paths]
+    total = len(head) + sum(sizes) + len(tail)
+    with open(export_file_path, 'w+b') as f:
+        os.ftruncate(f.fileno(), total)
+        with mmap.mmap(f.fileno(), total) as mm, memoryview(mm) as view:
+            view[:len(head)] = head
+            offset = len(head)
+            for fragment_path, size in zip(fragment_paths, sizes):
+                with open(fragment_path, 'rb') as fragment:
+                    fragment.readinto(view[offset:offset + size])
+                offset += size
+            view[offset:] = tail
+
+
+def _dump_table(db, table, fragment_path, since=None, until=None):
+    """
+    在独立的只读连接上导出一张表的结构和数据到片段文件
+    
+    Args:
+        db: 数据库对象
+        table: 表名
+        fragment_path: 片段文件路径
+        since: 起始日期（含）
+        until: 结束日期（含）
+        
+    Returns:
+        写入的记录数
+    """
+    conn = db.open_readonly_connection()
+    try:
+        count = 0
+        with open(fragment_path, 'w', encoding='utf-8') as f:
+            # 表结构
+            for (sql,) in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ):
+                f.write(f"{sql};\n")
+            
+            # 与iterdump相同，由sqlite的quote()生成各列的字面量，连同换行一起拼好整行
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+            values = " || ',' || ".join(f'quote("{column}")' for column in columns)
+            
+            # 日期范围条件走date列上的索引
+            conditions = []
+            params = []
+            if since is not None:
+                conditions.append("date >= ?")
+                params.append(str(since))
+            if until is not None:
+                conditions.append("date <= ?")
+                params.append(str(until))
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            
+            cursor = conn.execute(
+                f'''SELECT 'INSERT INTO "{table}" VALUES(' || {values} || ');' || char(10) FROM "{table}" {where}''',
+                params
+            )
+            # 每批取出若干行后一次写入
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                f.write("".join([row[0] for row in rows]))
+                count += len(rows)
+            
+            # 索引
+            for (sql,) in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            ):
+                f.write(f"{sql};\n")
+        return count
+    finally:
+        conn.close()
+
+
 def main():
     """主函数"""
     # 解析命令行参数
-    export_file_path = None
-    if len(sys.argv) > 1:
-        export_file_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="导出数据库中的数据为SQL脚本")
+    parser.add_argument("export_file", nargs="?", help="导出文件路径（同--out）")
+    parser.add_argument("-o", "--out", help="导出文件路径，默认为data_export_YYYYMMDD_HHMMSS.sql")
+    parser.add_argument("--tables", nargs="+", choices=EXPORT_TABLES, default=list(EXPORT_TABLES),
+                        help="要导出的表，默认全部")
+    parser.add_argument("--since", type=date.fromisoformat, help="起始日期（含），格式YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="结束日期（含），格式YYYY-MM-DD")
+    args = parser.parse_args()
     
-    success = export_sql(export_file_path)
+    success = export_sql(
+        args.out or args.export_file,
+        tables=args.tables,
+        since=args.since,
+        until=args.until
+    )
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
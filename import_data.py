@@ -11,163 +11,333 @@ import os
 from datetime import datetime
 from config.database import Database
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
-def import_data(import_file_path):
+
+# 每批写入数据库的记录数
+IMPORT_BATCH_SIZE = 10000
+
+# 各表记录的必需字段（对应NOT NULL列及直接按键读取的字段）
+REQUIRED_FIELDS = {
+    "todo_items": ("id", "content", "date", "completed", "created_at", "priority"),
+    "study_sessions": ("id", "date", "start_time"),
+    "daily_stats": (
+        "id", "date", "total_study_time", "total_rest_time",
+        "session_count", "completion_rate", "updated_at"
+    ),
+    "timer_type_stats": ("id", "timer_type", "date", "usage_count", "total_time"),
+}
+
+# 导入期间使用的PRAGMA设置
+IMPORT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",
+    "foreign_keys": "OFF",
+}
+
+
+def _apply_import_pragmas(conn):
+    """
+    应用导入期间的PRAGMA设置
+    
+    Args:
+        conn: 数据库连接
+        
+    Returns:
+        原有设置，用于导入结束后恢复
+    """
+    previous = {}
+    for name, value in IMPORT_PRAGMAS.items():
+        previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def _restore_pragmas(conn, previous):
+    """
+    恢复导入前的PRAGMA设置
+    
+    Args:
+        conn: 数据库连接
+        previous: 原有设置
+    """
+    for name, value in previous.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _iter_batches(import_file_path, table, export_data=None):
+    """
+    按批读取导出文件中某个表的记录
+    
+    安装了ijson时逐条解析文件，内存占用与文件大小无关；
+    否则从已加载的export_data中读取。
+    
+    Args:
+        import_file_path: 导入文件路径
+        table: 表名
+        export_data: 已加载的导出数据（未安装ijson时使用）
+        
+    Yields:
+        记录字典列表
+    """
+    if export_data is not None:
+        yield from _valid_batches(export_data.get(table, []), table)
+    else:
+        # ijson只能顺序读取，每个表重新打开一次文件
+        with open(import_file_path, 'rb') as f:
+            yield from _valid_batches(ijson.items(f, f'{table}.item', use_float=True), table)
+
+
+def _valid_batches(items, table):
+    """
+    预先检查记录并按批分组，缺少必需字段的记录跳过并提示
+    
+    检查在写入数据库之前完成，因此批量插入时无需再逐条捕获异常。
+    
+    Args:
+        items: 记录迭代器
+        table: 表名
+        
+    Yields:
+        通过检查的记录字典列表
+    """
+    required = REQUIRED_FIELDS[table]
+    batch = []
+    for item in items:
+        if not isinstance(item, dict) or any(item.get(field) is None for field in required):
+            item_id = item.get("id") if isinstance(item, dict) else None
+            print(f"跳过无效的{table}记录 (ID: {item_id}): 缺少必需字段")
+            continue
+        batch.append(item)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _read_export_timestamp(import_file_path):
+    """
+    读取导出文件中的导出时间（ijson方式）
+    
+    Args:
+        import_file_path: 导入文件路径
+        
+    Returns:
+        导出时间字符串
+    """
+    with open(import_file_path, 'rb') as f:
+        return next(ijson.items(f, 'export_timestamp'), '未知')
+
+
+def _refresh_stats(cursor, session_dates):
+    """
+    按会话数据重新计算指定日期的计时器类型统计和每日统计
+    
+    与Database._update_daily_stats的计算方式相同，但对所有日期一次完成，且不提交事务。
+    
+    Args:
+        cursor: 数据库游标
+        session_dates: 日期字符串集合
+    """
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS import_dates (date TEXT PRIMARY KEY)")
+    cursor.execute("DELETE FROM import_dates")
+    cursor.executemany("INSERT INTO import_dates (date) VALUES (?)", [(d,) for d in session_dates])
+    
+    # 按日期和类型汇总
+    type_stats_sql = '''
+        SELECT date,
+               timer_type,
+               COUNT(*)                                                 as session_count,
+               SUM(CASE WHEN completed THEN actual_duration ELSE 0 END) as completed_time,
+               AVG(CASE WHEN completed THEN 1.0 ELSE 0.0 END)           as completion_rate
+        FROM study_sessions
+        WHERE date IN (SELECT date FROM import_dates) AND actual_duration IS NOT NULL
+        GROUP BY date, timer_type
+    '''
+    
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO timer_type_stats 
+        (timer_type, date, usage_count, total_time)
+        SELECT timer_type, date, session_count, completed_time
+        FROM ({type_stats_sql})
+    ''')
+    
+    # 没有会话的日期同样写入一条全零的统计
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO daily_stats 
+        (date, total_study_time, total_rest_time, session_count, completion_rate, updated_at)
+        SELECT d.date,
+               COALESCE(SUM(CASE WHEN t.timer_type = 'study' THEN t.completed_time END), 0),
+               COALESCE(SUM(CASE WHEN t.timer_type = 'rest' THEN t.completed_time END), 0),
+               COALESCE(SUM(t.session_count), 0),
+               COALESCE(AVG(t.completion_rate), 0),
+               ?
+        FROM import_dates d
+        LEFT JOIN ({type_stats_sql}) t ON t.date = d.date
+        GROUP BY d.date
+    ''', (datetime.now(),))
+    
+    cursor.execute("DROP TABLE import_dates")
+
+
+def _session_values(session):
+    """
+    将导出的会话记录转换为插入参数（ID在最前，created_at在最后）
+    
+    Args:
+        session: 导出的会话字典
+        
+    Returns:
+        参数元组
+    """
+    actual_duration = session.get("actual_duration")
+    planned_duration = session.get("planned_duration")
+    if planned_duration is None:
+        planned_duration = actual_duration or 0  # 与add_session_direct一致，缺省为实际时长
+    return (
+        session["id"],
+        session["date"],
+        session["start_time"],
+        session.get("end_time"),
+        session.get("timer_type", "study"),
+        planned_duration,
+        actual_duration or 0,
+        bool(session.get("completed", True)),
+        session.get("notes", ""),
+        session.get("todo_id"),
+        session.get("todo_content", ""),
+        session.get("created_at")
+    )
+
+
+def import_data(import_file_path, db=None):
     """
     从JSON文件导入数据到数据库
     
     Args:
         import_file_path: 导入文件路径
+        db: 数据库对象，默认新建；由调用方传入时沿用其连接且不关闭
     """
     if not os.path.exists(import_file_path):
         print(f"错误: 导入文件不存在: {import_file_path}")
         return False
     
-    # 初始化数据库
-    db = Database()
+    # 初始化数据库（未传入时才新建，并在结束时关闭）
+    owns_db = db is None
+    if owns_db:
+        db = Database()
     
     try:
-        # 读取导出的数据
-        with open(import_file_path, 'r', encoding='utf-8') as f:
-            export_data = json.load(f)
+        # 读取导出的数据：有ijson时按表流式解析，否则整体加载
+        if IJSON_AVAILABLE:
+            export_data = None
+            export_timestamp = _read_export_timestamp(import_file_path)
+        else:
+            with open(import_file_path, 'r', encoding='utf-8') as f:
+                export_data = json.load(f)
+            export_timestamp = export_data.get('export_timestamp', '未知')
         
         print(f"正在从 {import_file_path} 导入数据...")
-        print(f"导出时间: {export_data.get('export_timestamp', '未知')}")
+        print(f"导出时间: {export_timestamp}")
         
         # 获取数据库连接
         conn = db._get_connection()
         cursor = conn.cursor()
         
-        # 开始事务
-        conn.execute("BEGIN TRANSACTION")
+        # 导入期间放宽持久性要求，结束后恢复原设置
+        previous_pragmas = _apply_import_pragmas(conn)
         
         try:
-            # 清空现有数据（可选，根据需求决定是否需要）
-            # 注意：这里我们不会清空数据，而是直接插入，让数据库处理重复ID的情况
-            
-            # 导入TODO项目数据
-            todo_count = 0
-            for todo_item in export_data.get("todo_items", []):
-                try:
-                    cursor.execute('''
+            # 连接作为上下文管理器：成功时提交，异常时回滚
+            with conn:
+                # 清空现有数据（可选，根据需求决定是否需要）
+                # 注意：这里我们不会清空数据，而是直接插入，让数据库处理重复ID的情况
+                
+                # 导入TODO项目数据
+                todo_count = 0
+                for batch in _iter_batches(import_file_path, "todo_items", export_data):
+                    cursor.executemany('''
                         INSERT OR REPLACE INTO todo_items 
                         (id, content, date, completed, created_at, completed_at, priority)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        todo_item["id"],
-                        todo_item["content"],
-                        todo_item["date"],
-                        todo_item["completed"],
-                        todo_item["created_at"],
-                        todo_item.get("completed_at"),
-                        todo_item["priority"]
-                    ))
-                    todo_count += 1
-                except Exception as e:
-                    print(f"导入TODO项目失败 (ID: {todo_item['id']}): {e}")
-            
-            # 导入学习会话数据
-            session_count = 0
-            for session in export_data.get("study_sessions", []):
-                try:
-                    # 检查会话是否已存在
-                    existing_session = cursor.execute(
-                        'SELECT id FROM study_sessions WHERE id = ?', 
-                        (session["id"],)
-                    ).fetchone()
-                    
-                    if existing_session:
-                        # 更新现有会话
-                        cursor.execute('''
-                            UPDATE study_sessions SET
-                            date = ?,
-                            start_time = ?,
-                            end_time = ?,
-                            timer_type = ?,
-                            planned_duration = ?,
-                            actual_duration = ?,
-                            completed = ?,
-                            notes = ?,
-                            todo_id = ?,
-                            todo_content = ?,
-                            created_at = ?
-                            WHERE id = ?
-                        ''', (
-                            session["date"],
-                            session["start_time"],
-                            session.get("end_time"),
-                            session.get("timer_type", "study"),
-                            session.get("planned_duration"),
-                            session.get("actual_duration"),
-                            bool(session.get("completed", True)),
-                            session.get("notes", ""),
-                            session.get("todo_id"),
-                            session.get("todo_content", ""),
-                            session.get("created_at"),
-                            session["id"]
-                        ))
-                    else:
-                        # 使用add_session_direct方法导入新会话数据
-                        db.add_session_direct(
-                            date_str=session["date"],
-                            start_time=session["start_time"],
-                            end_time=session.get("end_time"),
-                            duration_minutes=session["actual_duration"]/60 if session["actual_duration"] else 0,
-                            notes=session.get("notes", ""),
-                            todo_id=session.get("todo_id"),
-                            timer_type=session.get("timer_type", "study"),
-                            planned_duration=session.get("planned_duration"),
-                            actual_duration=session.get("actual_duration"),
-                            completed=bool(session.get("completed", True)),
-                            todo_content=session.get("todo_content", ""),
-                            id=session["id"]
+                    ''', [
+                        (
+                            todo_item["id"],
+                            todo_item["content"],
+                            todo_item["date"],
+                            todo_item["completed"],
+                            todo_item["created_at"],
+                            todo_item.get("completed_at"),
+                            todo_item["priority"]
                         )
-                    session_count += 1
-                except Exception as e:
-                    print(f"导入学习会话失败 (ID: {session['id']}): {e}")
-            
-            # 导入每日统计数据
-            stats_count = 0
-            for stat in export_data.get("daily_stats", []):
-                try:
-                    cursor.execute('''
+                        for todo_item in batch
+                    ])
+                    todo_count += len(batch)
+                
+                # 导入学习会话数据，已存在的ID直接整行替换
+                session_count = 0
+                session_dates = set()
+                for batch in _iter_batches(import_file_path, "study_sessions", export_data):
+                    rows = [_session_values(session) for session in batch]
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO study_sessions 
+                        (id, date, start_time, end_time, timer_type, planned_duration, 
+                         actual_duration, completed, notes, todo_id, todo_content, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                    ''', rows)
+                    session_dates.update(row[1] for row in rows)
+                    session_count += len(rows)
+                
+                # 涉及的日期在同一事务内一次性重新计算统计数据
+                if session_dates:
+                    _refresh_stats(cursor, session_dates)
+                
+                # 导入每日统计数据
+                stats_count = 0
+                for batch in _iter_batches(import_file_path, "daily_stats", export_data):
+                    cursor.executemany('''
                         INSERT OR REPLACE INTO daily_stats 
                         (id, date, total_study_time, total_rest_time, session_count, completion_rate, updated_at)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        stat["id"],
-                        stat["date"],
-                        stat["total_study_time"],
-                        stat["total_rest_time"],
-                        stat["session_count"],
-                        stat["completion_rate"],
-                        stat["updated_at"]
-                    ))
-                    stats_count += 1
-                except Exception as e:
-                    print(f"导入每日统计数据失败 (ID: {stat['id']}): {e}")
-            
-            # 导入计时器类型统计数据
-            timer_stats_count = 0
-            for stat in export_data.get("timer_type_stats", []):
-                try:
-                    cursor.execute('''
+                    ''', [
+                        (
+                            stat["id"],
+                            stat["date"],
+                            stat["total_study_time"],
+                            stat["total_rest_time"],
+                            stat["session_count"],
+                            stat["completion_rate"],
+                            stat["updated_at"]
+                        )
+                        for stat in batch
+                    ])
+                    stats_count += len(batch)
+                
+                # 导入计时器类型统计数据
+                timer_stats_count = 0
+                for batch in _iter_batches(import_file_path, "timer_type_stats", export_data):
+                    cursor.executemany('''
                         INSERT OR REPLACE INTO timer_type_stats 
                         (id, timer_type, date, usage_count, total_time)
                         VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        stat["id"],
-                        stat["timer_type"],
-                        stat["date"],
-                        stat["usage_count"],
-                        stat["total_time"]
-                    ))
-                    timer_stats_count += 1
-                except Exception as e:
-                    print(f"导入计时器类型统计数据失败 (ID: {stat['id']}): {e}")
-            
-            # 提交事务
-            conn.commit()
+                    ''', [
+                        (
+                            stat["id"],
+                            stat["timer_type"],
+                            stat["date"],
+                            stat["usage_count"],
+                            stat["total_time"]
+                        )
+                        for stat in batch
+                    ])
+                    timer_stats_count += len(batch)
             
             print(f"数据导入成功！共导入:")
             print(f"  - TODO项目: {todo_count} 条")
@@ -178,17 +348,17 @@ def import_data(import_file_path):
             return True
             
         except Exception as e:
-            # 回滚事务
-            conn.rollback()
             print(f"数据导入过程中发生错误，已回滚: {e}")
             return False
+        finally:
+            _restore_pragmas(conn, previous_pragmas)
             
     except Exception as e:
         print(f"数据导入失败: {e}")
         return False
     finally:
-        # 关闭数据库连接
-        if db:
+        # 关闭自行创建的数据库连接
+        if owns_db:
             db.close()
 
 
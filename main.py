@@ -9,16 +9,15 @@
 import sys
 import os
 import logging
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QIcon, QFont
 
-# 项目模块导入
-from ui.main_window import MainWindow
+# 项目模块导入（Qt及界面模块在单例检查之后才导入，见create_application/create_main_window）
 from config.settings import Settings
 from config.database import Database
 from core.singleton import SingletonApp
 
+# 进程DPI感知只需设置一次
+_dpi_set = False
+
 
 class FocusTimerApp:
     """专注计时器应用程序主类"""
@@ -62,10 +61,9 @@ class FocusTimerApp:
             'logs'
         ]
 
+        # 目录已存在时makedirs不做任何事，无需先检查
         for directory in directories:
-            if not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
-                self.logger.info(f"创建目录: {directory}")
+            os.makedirs(directory, exist_ok=True)
 
     def initialize_components(self):
         """初始化核心组件"""
@@ -85,6 +83,9 @@ class FocusTimerApp:
 
     def create_application(self):
         """创建QT应用程序"""
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtGui import QIcon, QFont
+        
         # 在创建QApplication之前设置高DPI缩放属性
         self.setup_high_dpi_scaling()
         
@@ -108,6 +109,17 @@ class FocusTimerApp:
         
     def setup_high_dpi_scaling(self):
         """设置高DPI缩放支持"""
+        global _dpi_set
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import Qt
+        
+        # 设置Qt的高DPI缩放属性（所有平台）
+        # 这些设置需要在创建QApplication前设置
+        if hasattr(Qt, 'AA_EnableHighDpiScaling'):
+            QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+        if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
+            QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+        
         # 检测操作系统版本
         import platform
         if platform.system() == "Windows":
@@ -115,13 +127,6 @@ class FocusTimerApp:
             win_version = platform.version()
             self.logger.info(f"Windows版本: {win_version}")
             
-            # 设置Qt的高DPI缩放属性
-            # 这些设置需要在创建QApplication前设置
-            if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-                QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-            if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-                QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-            
             # Windows 10特定的兼容性设置
             if "10." in win_version:
                 self.logger.info("应用Windows 10兼容性设置")
@@ -131,15 +136,19 @@ class FocusTimerApp:
                         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
                     )
                 # 设置进程DPI感知（需要在Windows上使用）
-                try:
-                    from ctypes import windll
-                    windll.user32.SetProcessDPIAware()
-                except Exception as e:
-                    self.logger.warning(f"设置DPI感知失败: {e}")
+                if not _dpi_set:
+                    try:
+                        from ctypes import windll
+                        windll.user32.SetProcessDPIAware()
+                        _dpi_set = True
+                    except Exception as e:
+                        self.logger.warning(f"设置DPI感知失败: {e}")
 
     def create_main_window(self):
         """创建主窗口"""
         try:
+            from ui.main_window import MainWindow
+            
             self.main_window = MainWindow(
                 settings=self.settings,
                 database=self.database
@@ -208,13 +217,7 @@ class FocusTimerApp:
 
 def main():
     """主函数"""
-    # 设置高DPI支持
-    if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-
-    # 创建并运行应用程序
+    # 创建并运行应用程序（高DPI属性在create_application中设置）
     app = FocusTimerApp()
     return app.run()
 
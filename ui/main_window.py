@@ -8,8 +8,10 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QStackedWidget, QPushButton, QLabel, QFrame,
                              QSystemTrayIcon, QMenu, QAction, QMessageBox,
-                             QApplication)
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer, QAbstractNativeEventFilter
+                             QApplication, QDialog, QFormLayout, QLineEdit,
+                             QComboBox, QDialogButtonBox)
+from PyQt5.QtCore import (Qt, QSize, pyqtSignal, QTimer, QAbstractNativeEventFilter,
+                          QObject, QRunnable, QThreadPool)
 from PyQt5.QtGui import QIcon, QFont, QPixmap, QPalette, QColor
 
 import sys
@@ -17,41 +19,193 @@ import os
 import platform
 import logging
 import ctypes
+import ctypes.wintypes
+import functools
+import time
 import win32con
-from datetime import datetime
-from typing import Optional, Tuple, Any, Union
+from dataclasses import dataclass
+from datetime import datetime, date
+from pathlib import Path
+from typing import Optional, Tuple, Any, Union, Final, Dict
 
 # 项目模块导入
 from ui.timer_widget import TimerWidget
-from ui.settings_widget import SettingsWidget
-from ui.stats_widget import StatsWidget
 from config.settings import Settings
 from config.database import Database
 from core.audio_manager import AudioManager
+from core.db_writer import DbWriter
 
 # 定义Windows消息常量
 WM_SHOWAPP = win32con.WM_USER + 1
 
+# 操作系统信息只在导入时检测一次
+_IS_WINDOWS = platform.system() == "Windows"
+_WIN_VERSION = platform.version() if _IS_WINDOWS else ""
+_IS_WIN10 = _IS_WINDOWS and "10." in _WIN_VERSION
+
+# 系统默认提示音（winsound仅在Windows上可用）
+try:
+    import winsound
+    _BEEP = winsound.MessageBeep
+except ImportError:
+    _BEEP = None
+
+# 界面字体按字号和粗细缓存（QFont需在QApplication创建后构造，因此不在导入时创建）
+@functools.lru_cache(maxsize=None)
+def _app_font(size: int, weight: int = QFont.Normal) -> QFont:
+    return QFont("Microsoft YaHei", size, weight)
+
+
+# 各页面在堆栈中的固定索引
+_PAGE_INDEX: Final[Dict[str, int]] = {"timer": 0, "stats": 1, "todo": 2, "settings": 3}
+
+# 提醒音路径缓存的"未解析"标记（None表示已解析但没有可用文件）
+_UNSET = object()
+
+# 样式表只在模块加载时构建一次，各实例直接复用
+# 导航栏样式
+_NAV_QSS = """
+    NavigationBar {
+        background-color: #ffffff;
+        border-bottom: 2px solid #e0e0e0;
+    }
+
+    QLabel#titleLabel {
+        color: #2c3e50;
+        font-weight: bold;
+    }
+
+    QPushButton {
+        background-color: #f5f5f5;
+        color: #2c3e50;
+        border: 1px solid #e0e0e0;
+        border-radius: 5px;
+        font-size: 12px;
+        font-weight: bold;
+    }
+
+    QPushButton:hover {
+        background-color: #e0e0e0;
+    }
+
+    QPushButton:pressed {
+        background-color: #d0d0d0;
+    }
+
+    QPushButton[selected="true"] {
+        background-color: #3498db;
+        color: white;
+        border: 1px solid #3498db;
+    }
+"""
+
+# 主窗口样式
+_MAIN_QSS = """
+    QMainWindow {
+        background-color: #ecf0f1;
+    }
+
+    QStackedWidget {
+        background-color: #ecf0f1;
+        border: none;
+    }
+"""
+
+# 完成通知对话框样式
+_DIALOG_QSS = """
+    QDialog {
+        background-color: #ecf0f1;
+    }
+    QPushButton {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #2980b9;
+    }
+    QLabel {
+        font-size: 14px; 
+        color: #2c3e50;
+    }
+"""
+
+# 完成通知消息框样式
+_MSGBOX_QSS = """
+    QMessageBox {
+        background-color: #ecf0f1;
+        font-size: 14px;
+    }
+    QMessageBox QLabel {
+        color: #2c3e50;
+    }
+"""
+
+@dataclass(frozen=True)
+class NotifPrefs:
+    """计时完成时使用的通知设置快照"""
+    __slots__ = ('sound', 'popup', 'show_main')
+
+    sound: bool
+    popup: bool
+    show_main: bool
+
+
+# 在线程池中执行的简单任务
+class _BackgroundTask(QRunnable):
+    def __init__(self, func, *args):
+        super().__init__()
+        self._func = func
+        self._args = args
+
+    def run(self):
+        try:
+            self._func(*self._args)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"后台任务执行失败: {e}")
+
+
+# 在此间隔内重复收到的WM_SHOWAPP只激活一次窗口（纳秒）
+SHOW_DEBOUNCE_NS = 250_000_000
+
+# MSG结构中message字段的偏移量，过滤器据此直接读取消息ID
+_MSG_FIELD_OFFSET = ctypes.wintypes.MSG.message.offset
+
+
+# 原生事件过滤器发出的信号（QAbstractNativeEventFilter本身不是QObject）
+class _NativeEventNotifier(QObject):
+    show_requested = pyqtSignal()
+
+
 # 原生事件过滤器，用于处理Windows消息
 class NativeEventFilter(QAbstractNativeEventFilter):
     def __init__(self, window):
         super().__init__()
         self.window = window
         self.logger = logging.getLogger(__name__)
+        # 窗口操作不在消息分发过程中执行，由接收方以排队连接处理
+        self.notifier = _NativeEventNotifier(window)
+        # 每条原生消息都会经过过滤器，预先取好比较和回调所需的属性
+        self._target_msg = WM_SHOWAPP
+        self._request_show = self.notifier.show_requested.emit
+        # 上次请求激活窗口的时间，用于合并短时间内的重复消息
+        self._last_show_ns = 0
         
     def nativeEventFilter(self, eventType, message):
-        # 将消息转换为整数值
-        try:
-            msg = ctypes.c_uint(int(message)).value
-            # 检查是否是我们的自定义消息
-            if msg == WM_SHOWAPP:
-                self.logger.info("收到WM_SHOWAPP消息，激活窗口")
-                self.window.show_window()
-                return True, 0
-        except Exception as e:
-            self.logger.error(f"处理原生事件时出错: {e}")
+        # message指向MSG结构，只读取其中的message字段
+        if ctypes.c_uint.from_address(int(message) + _MSG_FIELD_OFFSET).value != self._target_msg:
+            return False, 0
+        
+        now = time.monotonic_ns()
+        if now - self._last_show_ns < SHOW_DEBOUNCE_NS:
+            return True, 0
+        self._last_show_ns = now
         
-        return False, 0
+        self.logger.info("收到WM_SHOWAPP消息，激活窗口")
+        self._request_show()
+        return True, 0
 
 
 class NavigationBar(QFrame):
@@ -79,8 +233,7 @@ class NavigationBar(QFrame):
         # 应用标题
         title_label = QLabel("专注学习计时器")
         title_label.setObjectName("titleLabel")
-        title_font = QFont("Microsoft YaHei", 16, QFont.Bold)
-        title_label.setFont(title_font)
+        title_label.setFont(_app_font(16, QFont.Bold))
         layout.addWidget(title_label)
 
         # 弹性空间
@@ -98,7 +251,8 @@ class NavigationBar(QFrame):
             btn = QPushButton(f"{icon} {page_name}")
             btn.setObjectName(f"navBtn_{page_id}")
             btn.setFixedSize(100, 40)
-            btn.clicked.connect(lambda checked, p=page_id: self.switch_page(p))
+            btn.setProperty("pageId", page_id)
+            btn.clicked.connect(self._on_nav_clicked)
 
             self.buttons[page_id] = btn
             layout.addWidget(btn)
@@ -108,66 +262,46 @@ class NavigationBar(QFrame):
 
     def setup_styles(self):
         """设置样式"""
-        self.setStyleSheet("""
-            NavigationBar {
-                background-color: #ffffff;
-                border-bottom: 2px solid #e0e0e0;
-            }
-
-            QLabel#titleLabel {
-                color: #2c3e50;
-                font-weight: bold;
-            }
-
-            QPushButton {
-                background-color: #f5f5f5;
-                color: #2c3e50;
-                border: 1px solid #e0e0e0;
-                border-radius: 5px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-
-            QPushButton:pressed {
-                background-color: #d0d0d0;
-            }
-
-            QPushButton[selected="true"] {
-                background-color: #3498db;
-                color: white;
-                border: 1px solid #3498db;
-            }
-        """)
+        self.setStyleSheet(_NAV_QSS)
+
+    def _on_nav_clicked(self):
+        """导航按钮点击处理（所有按钮共用）"""
+        self.switch_page(self.sender().property("pageId"))
 
     def switch_page(self, page_id: str):
         """切换页面"""
         if page_id != self.current_page:
+            old_page = self.current_page
             self.current_page = page_id
-            self.update_button_states()
+            # 只有原选中和新选中的按钮状态发生变化
+            self._restyle(old_page)
+            self._restyle(page_id)
             self.page_changed.emit(page_id)
 
     def update_button_states(self):
-        """更新按钮状态"""
-        for page_id, btn in self.buttons.items():
-            is_selected = page_id == self.current_page
-            btn.setProperty("selected", is_selected)
-            btn.style().unpolish(btn)
-            btn.style().polish(btn)
+        """更新所有按钮状态（初始化时使用）"""
+        for page_id in self.buttons:
+            self._restyle(page_id)
+
+    def _restyle(self, page_id: str):
+        """按选中状态重新应用单个按钮的样式"""
+        btn = self.buttons.get(page_id)
+        if btn is None:
+            return
+        btn.setProperty("selected", page_id == self.current_page)
+        style = btn.style()
+        style.unpolish(btn)
+        style.polish(btn)
 
 
 class MainWindow(QMainWindow):
     """主窗口类"""
 
+    # 学习会话已在后台写入数据库
+    session_recorded = pyqtSignal()
+
     def __init__(self, settings: Settings, database: Database):
         super().__init__()
-        
-        # 在创建QApplication后，窗口显示前设置高DPI缩放
-        # 注意：必须在super().__init__()之后调用
-        self.setup_high_dpi_scaling()
 
         self.settings = settings
         self.database = database
@@ -176,10 +310,38 @@ class MainWindow(QMainWindow):
         # 音频管理器
         self.audio_manager = AudioManager()
 
+        # 数据库写入线程，会话记录等写操作在后台执行
+        # 写入线程使用独立的连接，界面线程的commit不会提交写入线程未完成的事务
+        self._writer_database = Database(database.db_file)
+        self._db_writer = DbWriter(self)
+        self._db_writer.start()
+        # 无论从哪条路径退出（托盘菜单、关闭窗口、系统注销），都先执行完已提交的写操作
+        QApplication.instance().aboutToQuit.connect(self._stop_db_writer)
+
         # 页面组件
         self.timer_widget = None
         self.settings_widget = None
         self.stats_widget = None
+        self.todo_widget = None
+        
+        # 按日期缓存的待办事项：日期 -> (缓存代数, 待办事项)，计时开始时在后台预取
+        # 待办变化时代数加一，之前读取（包括仍在进行的预取）的结果随之失效
+        self._todo_items_cache: Dict[str, tuple] = {}
+        self._todo_items_generation = 0
+        
+        # 解析后的提醒音文件路径，启动和通知设置变化时在后台检查文件
+        self._cached_sound_file = _UNSET
+        self._sound_file_generation = 0
+        self.refresh_sound_file()
+        
+        # 通知设置快照，通知设置变化时重新读取
+        self._notif = self._load_notif_prefs()
+        
+        # 学习完成对话框，首次使用时创建
+        self._completion_dialog: Optional[QDialog] = None
+        self._completion_msg_label = None
+        self._completion_note_input = None
+        self._completion_todo_combo = None
         
         # 当前会话ID
         self.current_session_id = None
@@ -204,6 +366,7 @@ class MainWindow(QMainWindow):
         
         # 安装原生事件过滤器，用于处理单例消息
         self.native_event_filter = NativeEventFilter(self)
+        self.native_event_filter.notifier.show_requested.connect(self.show_window, Qt.QueuedConnection)
         QApplication.instance().installNativeEventFilter(self.native_event_filter)
         self.logger.info("已安装原生事件过滤器，用于处理单例消息")
 
@@ -226,7 +389,7 @@ class MainWindow(QMainWindow):
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         
         # 检测Windows版本并应用特定设置
-        if platform.system() == "Windows" and "10." in platform.version():
+        if _IS_WIN10:
             # Windows 10特定设置
             self.logger.info("应用Windows 10窗口特定设置")
             # 设置窗口属性以确保正确的DPI缩放
@@ -235,16 +398,7 @@ class MainWindow(QMainWindow):
             self.setAttribute(Qt.WA_DontCreateNativeAncestors, False)
 
         # 设置窗口样式
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #ecf0f1;
-            }
-
-            QStackedWidget {
-                background-color: #ecf0f1;
-                border: none;
-            }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
 
     def setup_ui(self):
         """设置用户界面"""
@@ -269,36 +423,63 @@ class MainWindow(QMainWindow):
         self.create_pages()
 
     def create_pages(self):
-        """创建各个页面"""
+        """创建各个页面（计时器页面立即创建，其余页面首次切换到时再创建）"""
         # 计时器页面
         self.timer_widget = TimerWidget(self.settings, self.database)
         # 设置音频管理器
         self.timer_widget.set_audio_manager(self.audio_manager)
+
         self.stacked_widget.addWidget(self.timer_widget)
 
-        # 统计页面
+        # 尚未创建的页面先用空白占位，保持_PAGE_INDEX中的索引不变
+        self._page_factories = {
+            "stats": self._create_stats_page,
+            "todo": self._create_todo_page,
+            "settings": self._create_settings_page
+        }
+        for _ in self._page_factories:
+            self.stacked_widget.addWidget(QWidget())
+
+        # 设置默认页面
+        self.stacked_widget.setCurrentIndex(0)
+
+    def _create_stats_page(self):
+        """创建统计页面"""
+        from ui.stats_widget import StatsWidget
         self.stats_widget = StatsWidget(self.settings, self.database)
-        self.stacked_widget.addWidget(self.stats_widget)
+        return self.stats_widget
 
-        # 待办事项页面
+    def _create_todo_page(self):
+        """创建待办事项页面"""
         from ui.todo_widget import TodoWidget
         self.todo_widget = TodoWidget(self.settings, self.database)
-        self.stacked_widget.addWidget(self.todo_widget)
+        self.todo_widget.todos_changed.connect(self._clear_todo_items_cache)
+        return self.todo_widget
 
-        # 设置页面
+    def _create_settings_page(self):
+        """创建设置页面"""
+        from ui.settings_widget import SettingsWidget
         self.settings_widget = SettingsWidget(self.settings, self.database)
-        self.stacked_widget.addWidget(self.settings_widget)
-
-        # 页面映射
-        self.page_mapping = {
-            "timer": 0,
-            "stats": 1,
-            "todo": 2,
-            "settings": 3
-        }
-
-        # 设置默认页面
-        self.stacked_widget.setCurrentIndex(0)
+        # 排队处理设置变更，设置页面的槽函数执行完后再更新其他组件
+        self.settings_widget.settings_changed.connect(self.on_settings_changed, Qt.QueuedConnection)
+        return self.settings_widget
+
+    def _ensure_page(self, index: int, page_id: str):
+        """
+        确保页面已创建，首次使用时替换掉占位页面
+
+        Args:
+            index: 页面在堆栈中的索引
+            page_id: 页面ID
+        """
+        factory = self._page_factories.pop(page_id, None)
+        if factory is None:
+            return
+        placeholder = self.stacked_widget.widget(index)
+        self.stacked_widget.insertWidget(index, factory())
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.logger.info(f"创建页面: {page_id}")
 
     def setup_system_tray(self):
         """设置系统托盘"""
@@ -359,30 +540,40 @@ class MainWindow(QMainWindow):
         # 导航栏页面切换
         self.navigation_bar.page_changed.connect(self.switch_page)
 
-        # 设置页面的信号连接
-        if self.settings_widget:
-            self.settings_widget.settings_changed.connect(self.on_settings_changed)
-
         # 计时器页面的信号连接
         if self.timer_widget:
             self.timer_widget.timer_finished.connect(self.on_timer_finished)
             self.timer_widget.timer_started.connect(self.on_timer_started)
 
+        self.session_recorded.connect(self.on_session_recorded)
+        self.stacked_widget.currentChanged.connect(self._on_stack_changed)
+
     def switch_page(self, page_id: str):
         """切换页面"""
-        if page_id in self.page_mapping:
-            index = self.page_mapping[page_id]
-            self.stacked_widget.setCurrentIndex(index)
-            self.logger.info(f"切换到页面: {page_id}")
+        index = _PAGE_INDEX.get(page_id)
+        if index is None:
+            return
+        self._ensure_page(index, page_id)
+        self.stacked_widget.setCurrentIndex(index)
+        self.logger.info(f"切换到页面: {page_id}")
 
-            # 页面激活时的特殊处理
-            if page_id == "stats":
-                self.stats_widget.refresh_data()
+    def _on_stack_changed(self, index: int):
+        """当前页面变化处理（页面激活时的特殊处理）"""
+        if index == _PAGE_INDEX["stats"] and self.stats_widget is not None:
+            self.stats_widget.refresh_data()
 
     def on_settings_changed(self, setting_key: str, value):
         """设置变更处理"""
         self.logger.info(f"设置变更: {setting_key} = {value}")
 
+        # 通知设置可能变化，更新快照
+        if setting_key == "all" or setting_key.startswith("notification."):
+            self._notif = self._load_notif_prefs()
+
+        # 提醒音设置可能变化，重新检查提醒音文件
+        if setting_key == "all" or setting_key.startswith("notification.sound"):
+            self.refresh_sound_file()
+
         # 根据设置变更更新相关组件
         if setting_key.startswith("timer."):
             if self.timer_widget:
@@ -408,6 +599,36 @@ class MainWindow(QMainWindow):
         self.current_timer_type = timer_type
         self.current_planned_duration = planned_duration
         self.current_timer_start_time = start_time
+        
+        # 学习结束时需要选择关联的待办事项，提前在后台加载
+        if timer_type == 'study':
+            QThreadPool.globalInstance().start(
+                _BackgroundTask(self._prefetch_todo_items, self._todo_items_generation,
+                                date.today().isoformat()))
+    
+    def _prefetch_todo_items(self, generation: int, date_str: str):
+        """在独立的只读连接上预取待办事项（在线程池中执行）"""
+        conn = self.database.open_readonly_connection()
+        try:
+            todo_items = tuple(self.database.get_todo_items(date_str, conn=conn))
+        finally:
+            conn.close()
+        # 记录开始时的代数，期间待办发生变化时读取方会忽略该结果
+        self._todo_items_cache[date_str] = (generation, todo_items)
+    
+    def _get_todo_items(self, date_str: str) -> tuple:
+        """获取指定日期的待办事项，缓存失效时在当前线程读取"""
+        cached = self._todo_items_cache.get(date_str)
+        if cached is not None and cached[0] == self._todo_items_generation:
+            return cached[1]
+        todo_items = tuple(self.database.get_todo_items(date_str))
+        self._todo_items_cache[date_str] = (self._todo_items_generation, todo_items)
+        return todo_items
+    
+    def _clear_todo_items_cache(self):
+        """待办事项变化时使缓存失效"""
+        self._todo_items_generation += 1
+        self._todo_items_cache.clear()
     
     def on_timer_finished(self, timer_type: str, duration: int, auto_completed: bool = True):
         """计时器完成处理"""
@@ -418,48 +639,32 @@ class MainWindow(QMainWindow):
         timer_name = timer_type_obj.get('name', '未知')
         
         # 只有学习计时器且时长大于0时才记录
-        session_id_for_note = None
+        session_future = None
         if timer_type == 'study' and duration > 0:
-            try:
-                # 在计时器完成时创建并结束会话
-                # 使用之前保存的计时器类型和计划时长
-                # 获取当前时间作为结束时间
-                end_time = datetime.now()
-                
-                # 创建会话，使用保存的计时器开始时间
-                session_id = self.database.start_session(self.current_timer_type, self.current_planned_duration, self.current_timer_start_time)
-                self.logger.info(f"创建学习会话: ID={session_id}, 类型={self.current_timer_type}, 计划时长={self.current_planned_duration}秒, 开始时间={self.current_timer_start_time}")
-                
-                # 立即结束会话，使用实际计时的时长
-                self.database.end_session(session_id, completed=True, actual_duration=duration)
-                self.logger.info(f"结束学习会话: ID={session_id}, 实际时长={duration}秒, 结束时间={end_time}")
-                
-                # 保存会话ID用于备注
-                session_id_for_note = session_id
-                
-                # 刷新统计页面数据（如果已加载）
-                if self.stats_widget:
-                    self.stats_widget.refresh_data()
-                    
-                # 重置当前计时器信息
-                self.current_timer_type = None
-                self.current_planned_duration = None
-                self.current_timer_start_time = None
-            except Exception as e:
-                self.logger.error(f"记录学习时间失败: {e}")
+            # 在计时器完成时创建并结束会话，写操作交给后台线程
+            # 使用之前保存的计时器类型、计划时长和开始时间
+            session_future = self._db_writer.submit(
+                self._record_session, self.current_timer_type, self.current_planned_duration,
+                self.current_timer_start_time, duration)
+            session_future.add_done_callback(self._on_session_future_done)
+            
+            # 重置当前计时器信息
+            self.current_timer_type = None
+            self.current_planned_duration = None
+            self.current_timer_start_time = None
 
         # 播放提醒音（先播放音乐，再显示弹窗）
         # 对所有计时器类型，在自动完成时都播放提示音
-        if self.settings.get("notification.sound_enabled", True) and auto_completed:
+        if self._notif.sound and auto_completed:
             self.play_notification_sound()
             
         # 显示通知弹窗（对所有计时器类型）
-        if self.settings.get("notification.popup_enabled", True):
-            self.show_completion_notification(timer_type, duration, session_id_for_note)
+        if self._notif.popup:
+            self.show_completion_notification(timer_type, duration, session_future)
 
             
         # 根据设置决定是否显示主窗口
-        if self.settings.get("notification.show_main_window", True) and not self.isVisible():
+        if self._notif.show_main and not self.isVisible():
             self.show_window()
 
         # 如果窗口被最小化或隐藏，显示系统托盘通知
@@ -472,7 +677,53 @@ class MainWindow(QMainWindow):
                 5000
             )
 
-    def show_completion_notification(self, timer_type: str, duration: int, session_id=None):
+    def _record_session(self, timer_type: str, planned_duration: int, start_time, duration: int) -> int:
+        """创建并结束学习会话（在数据库写入线程中执行）"""
+        # 获取当前时间作为结束时间
+        end_time = datetime.now()
+        
+        # 创建会话，使用保存的计时器开始时间
+        session_id = self._writer_database.start_session(timer_type, planned_duration, start_time)
+        self.logger.info(f"创建学习会话: ID={session_id}, 类型={timer_type}, 计划时长={planned_duration}秒, 开始时间={start_time}")
+        
+        # 立即结束会话，使用实际计时的时长
+        self._writer_database.end_session(session_id, completed=True, actual_duration=duration)
+        self.logger.info(f"结束学习会话: ID={session_id}, 实际时长={duration}秒, 结束时间={end_time}")
+        return session_id
+    
+    def _on_session_future_done(self, future):
+        """会话写入完成回调（可能在写入线程中调用，通过信号转回界面线程）"""
+        if future.exception() is not None:
+            self.logger.error(f"记录学习时间失败: {future.exception()}")
+            return
+        self.session_recorded.emit()
+    
+    def on_session_recorded(self):
+        """学习会话写入完成处理"""
+        # 刷新统计页面数据（如果已加载）
+        if self.stats_widget:
+            self.stats_widget.refresh_data()
+    
+    def _save_session_details(self, session_future, note: str, todo_id):
+        """保存会话备注和关联的TODO（在数据库写入线程中执行）"""
+        try:
+            # 写入线程按顺序执行，此时会话记录已经完成
+            session_id = session_future.result()
+            
+            # 更新会话备注
+            if note:
+                self._writer_database.update_session_notes(session_id, note)
+                self.logger.info(f"已添加会话备注: ID={session_id}, 备注={note}")
+            
+            # 更新关联的TODO
+            if todo_id is not None:
+                # 使用数据库方法更新关联的TODO
+                self._writer_database.update_session_todo(session_id, todo_id)
+                self.logger.info(f"已关联TODO: 会话ID={session_id}, TODO ID={todo_id}")
+        except Exception as e:
+            self.logger.error(f"更新会话信息失败: {e}")
+    
+    def show_completion_notification(self, timer_type: str, duration: int, session_future=None):
         """显示完成通知弹窗"""
         minutes = duration // 60
         seconds = duration % 60
@@ -481,93 +732,36 @@ class MainWindow(QMainWindow):
         message = f"{timer_name}时间结束！\n持续时间：{minutes}分{seconds}秒"
         
         # 只有学习计时器才需要备注
-        if timer_type == "study" and session_id is not None:
-            from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QDialogButtonBox, QComboBox, QFormLayout
-            
-            # 创建自定义对话框
-            dialog = QDialog(self)
-            dialog.setWindowTitle("计时完成")
-            dialog.setMinimumWidth(400)
-            
-            layout = QVBoxLayout(dialog)
-            
-            # 添加消息标签
-            msg_label = QLabel(message)
-            msg_label.setStyleSheet("font-size: 14px; color: #2c3e50;")
-            layout.addWidget(msg_label)
-            
-            # 创建表单布局
-            form_layout = QFormLayout()
-            layout.addLayout(form_layout)
+        if timer_type == "study" and session_future is not None:
+            dialog = self._get_completion_dialog()
             
-            # 添加备注输入框
-            note_input = QLineEdit()
-            note_input.setPlaceholderText("记录这段时间做了什么...")
-            note_input.setStyleSheet("padding: 8px;")
-            form_layout.addRow("添加备注:", note_input)
+            # 复用对话框，只更新消息并清空上次的输入
+            self._completion_msg_label.setText(message)
+            self._completion_note_input.clear()
             
             # 获取当前日期的TODO列表
             session_date = datetime.now().date()
-            todo_items = self.database.get_todo_items(session_date.isoformat())
+            todo_items = self._get_todo_items(session_date.isoformat())
             
-            # 添加TODO关联下拉框
-            todo_combo = QComboBox()
-            todo_combo.setStyleSheet("padding: 8px;")
+            todo_combo = self._completion_todo_combo
+            todo_combo.clear()
             todo_combo.addItem("无关联", None)
             
-            # 添加TODO项目到下拉框
-            for todo in todo_items:
-                todo_combo.addItem(todo['content'], todo['id'])
-            
-            form_layout.addRow("关联待办事项:", todo_combo)
-            
-            # 添加按钮
-            button_box = QDialogButtonBox(QDialogButtonBox.Ok)
-            button_box.accepted.connect(dialog.accept)
-            layout.addWidget(button_box)
-            
-            # 设置对话框样式
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: #ecf0f1;
-                }
-                QPushButton {
-                    background-color: #3498db;
-                    color: white;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                }
-                QPushButton:hover {
-                    background-color: #2980b9;
-                }
-                QLabel {
-                    font-size: 14px; 
-                    color: #2c3e50;
-                }
-            """)
+            # 添加TODO项目到下拉框（第0项为"无关联"）
+            todo_combo.addItems([todo['content'] for todo in todo_items])
+            for i, todo in enumerate(todo_items, 1):
+                todo_combo.setItemData(i, todo['id'])
             
             # 显示对话框
             if dialog.exec_() == QDialog.Accepted:
                 # 获取备注内容
-                note = note_input.text().strip()
+                note = self._completion_note_input.text().strip()
                 
                 # 获取选中的TODO ID
                 todo_id = todo_combo.currentData()
                 
-                try:
-                    # 更新会话备注
-                    if note:
-                        self.database.update_session_notes(session_id, note)
-                        self.logger.info(f"已添加会话备注: ID={session_id}, 备注={note}")
-                    
-                    # 更新关联的TODO
-                    if todo_id is not None:
-                        # 使用数据库方法更新关联的TODO
-                        self.database.update_session_todo(session_id, todo_id)
-                        self.logger.info(f"已关联TODO: 会话ID={session_id}, TODO ID={todo_id}")
-                except Exception as e:
-                    self.logger.error(f"更新会话信息失败: {e}")
+                if note or todo_id is not None:
+                    self._db_writer.submit(self._save_session_details, session_future, note, todo_id)
         else:
             # 非学习计时器使用简单消息框
             msg_box = QMessageBox(self)
@@ -577,35 +771,67 @@ class MainWindow(QMainWindow):
             msg_box.setStandardButtons(QMessageBox.Ok)
 
             # 设置弹窗样式
-            msg_box.setStyleSheet("""
-                QMessageBox {
-                    background-color: #ecf0f1;
-                    font-size: 14px;
-                }
-                QMessageBox QLabel {
-                    color: #2c3e50;
-                }
-            """)
+            msg_box.setStyleSheet(_MSGBOX_QSS)
 
             msg_box.exec_()
 
+    def _get_completion_dialog(self) -> QDialog:
+        """获取学习完成对话框，首次使用时创建，之后复用"""
+        if self._completion_dialog is not None:
+            return self._completion_dialog
+        
+        # 创建自定义对话框
+        dialog = QDialog(self)
+        dialog.setWindowTitle("计时完成")
+        dialog.setMinimumWidth(400)
+        
+        layout = QVBoxLayout(dialog)
+        
+        # 添加消息标签
+        msg_label = QLabel()
+        msg_label.setStyleSheet("font-size: 14px; color: #2c3e50;")
+        layout.addWidget(msg_label)
+        
+        # 创建表单布局
+        form_layout = QFormLayout()
+        layout.addLayout(form_layout)
+        
+        # 添加备注输入框
+        note_input = QLineEdit()
+        note_input.setPlaceholderText("记录这段时间做了什么...")
+        note_input.setStyleSheet("padding: 8px;")
+        form_layout.addRow("添加备注:", note_input)
+        
+        # 添加TODO关联下拉框
+        todo_combo = QComboBox()
+        todo_combo.setStyleSheet("padding: 8px;")
+        form_layout.addRow("关联待办事项:", todo_combo)
+        
+        # 添加按钮
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        button_box.accepted.connect(dialog.accept)
+        layout.addWidget(button_box)
+        
+        # 设置对话框样式
+        dialog.setStyleSheet(_DIALOG_QSS)
+        
+        self._completion_dialog = dialog
+        self._completion_msg_label = msg_label
+        self._completion_note_input = note_input
+        self._completion_todo_combo = todo_combo
+        return dialog
+
     def play_notification_sound(self):
         """播放提醒音"""
-        # 首先尝试从notification.sound.file获取音频文件路径
-        sound_file = self.settings.get("notification.sound.file")
-        
-        # 如果没有找到，尝试从notification.sound_file获取（兼容旧版本配置）
-        if not sound_file:
-            sound_file = self.settings.get("notification.sound_file")
-            
-        if sound_file and os.path.exists(sound_file):
+        sound_file = self._resolve_sound_file()
+        if sound_file:
             try:
                 # 使用音频管理器播放声音
                 self.audio_manager.play_sound(sound_file)
                 self.logger.info(f"播放提醒音: {sound_file}")
                 
                 # 如果计时器页面可见，更新音乐播放状态
-                if self.stacked_widget.currentIndex() == self.page_mapping.get("timer", 0) and self.timer_widget:
+                if self.stacked_widget.currentIndex() == _PAGE_INDEX["timer"] and self.timer_widget:
                     self.timer_widget.is_music_playing = True
                     self.timer_widget.current_music_file = sound_file
                     self.timer_widget.play_music_button.setText("暂停音乐")
@@ -614,26 +840,68 @@ class MainWindow(QMainWindow):
                 self.logger.error(f"播放提醒音失败: {e}")
                 # 使用系统默认声音作为备选
                 try:
-                    import winsound
-                    winsound.MessageBeep()
+                    if _BEEP:
+                        _BEEP()
                 except:
                     pass
         else:
             # 没有配置声音文件，使用系统默认声音
-            try:
-                import winsound
-                winsound.MessageBeep()
-            except ImportError:
+            if _BEEP is None:
                 self.logger.warning("无法播放提醒音：winsound模块不可用")
+                return
+            try:
+                _BEEP()
             except Exception as e:
                 self.logger.error(f"播放提醒音失败: {e}")
 
+    def _load_notif_prefs(self) -> NotifPrefs:
+        """读取通知设置快照"""
+        return NotifPrefs(
+            sound=self.settings.get("notification.sound_enabled", True),
+            popup=self.settings.get("notification.popup_enabled", True),
+            show_main=self.settings.get("notification.show_main_window", True)
+        )
+
+    def _configured_sound_file(self) -> Optional[str]:
+        """读取设置中的提醒音文件路径"""
+        # 首先尝试从notification.sound.file获取音频文件路径
+        sound_file = self.settings.get("notification.sound.file")
+
+        # 如果没有找到，尝试从notification.sound_file获取（兼容旧版本配置）
+        if not sound_file:
+            sound_file = self.settings.get("notification.sound_file")
+        return sound_file or None
+
+    def refresh_sound_file(self):
+        """重新解析提醒音文件，文件检查在线程池中进行"""
+        self._sound_file_generation += 1
+        sound_file = self._configured_sound_file()
+        if not sound_file:
+            self._cached_sound_file = None
+            return
+        self._cached_sound_file = _UNSET
+        QThreadPool.globalInstance().start(
+            _BackgroundTask(self._check_sound_file, self._sound_file_generation, sound_file))
+
+    def _check_sound_file(self, generation: int, sound_file: str):
+        """检查提醒音文件是否存在（在线程池中执行）"""
+        is_file = Path(sound_file).is_file()
+        # 期间设置又发生变化时，丢弃过期的结果
+        if generation == self._sound_file_generation:
+            self._cached_sound_file = sound_file if is_file else None
+
+    def _resolve_sound_file(self) -> Optional[str]:
+        """获取可用的提醒音文件路径，后台检查尚未完成时直接检查"""
+        if self._cached_sound_file is _UNSET:
+            sound_file = self._configured_sound_file()
+            self._cached_sound_file = sound_file if sound_file and Path(sound_file).is_file() else None
+        return self._cached_sound_file
+
     def update_ui_settings(self):
         """更新UI设置"""
         # 更新字体大小
         font_size = self.settings.get("ui.font_size", 12)
-        font = QFont("Microsoft YaHei", font_size)
-        self.setFont(font)
+        self.setFont(_app_font(font_size))
 
         # 更新透明度
         opacity = self.settings.get("ui.opacity", 1.0)
@@ -670,57 +938,30 @@ class MainWindow(QMainWindow):
         if self.timer_widget:
             self.timer_widget.start_timer(type_id="rest")
 
-    def setup_high_dpi_scaling(self):
-        """设置高DPI缩放支持"""
-        # 检测操作系统版本
-        if platform.system() == "Windows":
-            # 获取Windows版本
-            win_version = platform.version()
-            # 不使用logger，因为此时logger可能还未初始化
-            print(f"Windows版本: {win_version}")
-            
-            # 设置Qt的高DPI缩放属性
-            # 这些设置需要在创建QApplication后，显示窗口前设置
-            if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-                QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-            if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-                QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-            
-            # Windows 10特定的兼容性设置
-            if "10." in win_version:
-                print("应用Windows 10兼容性设置")
-                # 设置Windows 10下的DPI感知模式
-                if hasattr(Qt, 'HighDpiScaleFactorRoundingPolicy'):
-                    QApplication.setHighDpiScaleFactorRoundingPolicy(
-                        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-                    )
-                # 设置进程DPI感知（需要在Windows上使用）
-                try:
-                    from ctypes import windll
-                    windll.user32.SetProcessDPIAware()
-                except Exception as e:
-                    print(f"设置DPI感知失败: {e}")
-    
     def restore_window_state(self):
         """恢复窗口状态"""
-        window_size = self.settings.get("app.window_size", [800, 600])
-        self.resize(window_size[0], window_size[1])
+        width, height = self.settings.get("app.window_size", [800, 600])
 
         window_position = self.settings.get("app.window_position")
         if window_position:
-            self.move(window_position[0], window_position[1])
+            x, y = window_position
         else:
             # 居中显示
             screen = self.screen().availableGeometry()
-            self.move(
-                (screen.width() - self.width()) // 2,
-                (screen.height() - self.height()) // 2
-            )
+            x = (screen.width() - width) // 2
+            y = (screen.height() - height) // 2
+
+        # 一次性设置位置和大小，避免resize和move分别触发布局
+        self.setGeometry(x, y, width, height)
 
     def save_window_state(self):
         """保存窗口状态"""
-        self.settings.set("app.window_size", [self.width(), self.height()])
-        self.settings.set("app.window_position", [self.x(), self.y()])
+        # 与restore_window_state的setGeometry对应，保存不含边框的几何信息
+        geometry = self.geometry()
+        self.settings.update({
+            "app.window_size": [geometry.width(), geometry.height()],
+            "app.window_position": [geometry.x(), geometry.y()]
+        })
 
     def quit_application(self):
         """退出应用程序"""
@@ -748,6 +989,11 @@ class MainWindow(QMainWindow):
         # 直接退出应用程序，而不是调用close()
         QApplication.quit()
 
+    def _stop_db_writer(self):
+        """等待未完成的数据库写操作，然后关闭写入线程的连接"""
+        self._db_writer.stop()
+        self._writer_database.close()
+
     def closeEvent(self, event):
         """窗口关闭事件"""
         # 关闭窗口时，隐藏窗口但保持托盘运行
@@ -767,12 +1013,4 @@ class MainWindow(QMainWindow):
         else:
             # 保存窗口状态
             self.save_window_state()
-            event.accept()
-
-    def changeEvent(self, event):
-        """窗口状态变化事件"""
-        if event.type() == event.WindowStateChange:
-            # 当窗口最小化时，不再隐藏窗口，让其正常最小化到任务栏
-            pass
-
-        super().changeEvent(event)
\ No newline at end of file
+            event.accept()
\ No newline at end of file
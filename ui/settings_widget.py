@@ -8,18 +8,536 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QComboBox, QSpinBox, QCheckBox,
                              QTabWidget, QFormLayout, QLineEdit, QFileDialog,
-                             QListWidget, QListWidgetItem, QGroupBox, QDialog,
-                             QDialogButtonBox, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+                             QListView, QGroupBox, QDialog,
+                             QDialogButtonBox, QMessageBox, QProgressDialog)
+from PyQt5.QtCore import (Qt, pyqtSignal, QAbstractListModel, QModelIndex, QTimer,
+                          QRunnable, QThreadPool, QSignalBlocker, QObject, QThread)
 from PyQt5.QtGui import QIcon, QPixmap
 
 import os
 import logging
 import json
-import sqlite3
 import shutil
-from typing import Dict, List, Optional
-from datetime import datetime, date
+import gzip
+import importlib
+import importlib.util
+import itertools
+from functools import partial
+from typing import Dict, List, Iterator
+from datetime import datetime
+
+from config.database import Database
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+logger = logging.getLogger(__name__)
+
+# JSON导出时每批序列化的记录数
+EXPORT_BATCH_SIZE = 5000
+
+# 导出时每处理多少条记录报告一次进度
+EXPORT_PROGRESS_STEP = 1000
+
+# 导入时每批写入数据库的记录数
+IMPORT_BATCH_SIZE = 10000
+
+# SQL导出时每条INSERT语句包含的记录数
+SQL_INSERT_BATCH_SIZE = 500
+_SQL_EXPORT_COLUMNS = ("id", "date", "start_time", "end_time", "timer_type", "planned_duration",
+                       "actual_duration", "completed", "notes", "todo_id", "todo_content")
+_SQL_INSERT_PREFIX = f"INSERT INTO study_sessions ({', '.join(_SQL_EXPORT_COLUMNS)}) VALUES\n"
+
+# Excel导出的列：(记录字段, 表头)
+_EXCEL_COLUMNS = (
+    ('id', 'ID'),
+    ('date', '日期'),
+    ('start_time', '开始时间'),
+    ('end_time', '结束时间'),
+    ('timer_type', '计时器类型'),
+    ('planned_duration', '计划时长(秒)'),
+    ('actual_duration', '实际时长(秒)'),
+    ('completed', '已完成'),
+    ('notes', '备注'),
+    ('todo_id', '关联待办ID'),
+    ('todo_content', '待办内容'),
+    ('created_at', '创建时间'),
+)
+_EXCEL_EXPORT_KEYS = tuple(key for key, _ in _EXCEL_COLUMNS)
+
+# JSON导出的字段，顺序与导入模板一致
+_JSON_EXPORT_COLUMNS = ("date", "start_time", "end_time", "timer_type", "planned_duration",
+                        "actual_duration", "completed", "notes", "todo_id", "todo_content", "id")
+# 旧版数据库中不存在的列导出时使用的值
+_JSON_EXPORT_DEFAULTS = {"timer_type": "study", "notes": "", "todo_content": ""}
+
+
+# 导入文件对话框选项：不读取自定义目录图标、不解析符号链接，避免在慢速或网络目录上逐个访问文件
+_IMPORT_DIALOG_OPTIONS = (QFileDialog.DontUseCustomDirectoryIcons | QFileDialog.DontResolveSymlinks
+                          | QFileDialog.ReadOnly)
+
+# 由计时器类型名称生成ID时，把空白字符替换为下划线
+_ID_TRANS = str.maketrans({' ': '_', '\t': '_'})
+
+# 计时器类型列表的显示文本模板：名称 (分钟数 分钟)
+_LABEL_TMPL = "{0} ({1} 分钟)".format
+
+# 资源目录路径，只在导入模块时解析一次
+_RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+_SOUNDS_DIR = os.path.join(_RESOURCES_DIR, "sounds")
+_WALLPAPER_DIR = os.path.join(_RESOURCES_DIR, "wallpaper")
+
+# 音频文件列表缓存：(目录, 目录修改时间) -> 文件名列表，目录内容变化时修改时间随之改变
+_SOUND_LIST_CACHE: Dict[tuple, List[str]] = {}
+
+
+def _excel_date_str(value):
+    """把Excel单元格中的日期转换为YYYY-MM-DD字符串，无法转换时返回None"""
+    if isinstance(value, str):
+        return value
+    try:
+        return value.strftime('%Y-%m-%d')
+    except (AttributeError, ValueError):
+        return None
+
+
+def _dump_json_records(records: List[Dict]) -> bytes:
+    """把一批记录序列化为UTF-8编码的JSON数组元素（不含外层方括号）"""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(records, ensure_ascii=False, indent=2).encode('utf-8')
+    return data[1:-1]
+
+
+def _open_export_file(file_path: str, binary: bool):
+    """打开导出文件，扩展名为.gz时以gzip压缩写入"""
+    if file_path.lower().endswith('.gz'):
+        # 压缩级别1：速度最快，文本数据仍有数倍压缩比
+        if binary:
+            return gzip.open(file_path, 'wb', compresslevel=1)
+        return gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=1)
+    if binary:
+        return open(file_path, 'wb')
+    return open(file_path, 'w', encoding='utf-8', buffering=1 << 20)
+
+
+def _write_json_export(rows: Iterator[tuple], file_path: str):
+    """
+    分批序列化学习记录，逐批写入JSON数组
+    
+    Args:
+        rows: 按_JSON_EXPORT_COLUMNS排列的记录值元组，由Database.iter_session_rows生成
+        file_path: 导出文件路径
+    """
+    with _open_export_file(file_path, binary=True) as f:
+        f.write(b'[')
+        batch = []
+        separator = b''
+        for row in rows:
+            batch.append(dict(zip(_JSON_EXPORT_COLUMNS, row)))
+            if len(batch) == EXPORT_BATCH_SIZE:
+                f.write(separator + _dump_json_records(batch))
+                separator = b','
+                batch = []
+        if batch:
+            f.write(separator + _dump_json_records(batch))
+        f.write(b'\n]' if separator or batch else b']')
+
+
+def _write_sql_export(values: Iterator[str], file_path: str):
+    """
+    生成SQL脚本，包含表结构和数据
+    
+    Args:
+        values: 按_SQL_EXPORT_COLUMNS排列的记录字面量元组，由Database.iter_session_values生成
+        file_path: 导出文件路径
+    """
+    with _open_export_file(file_path, binary=False) as f:
+        f.write("-- 专注学习计时器数据导出\n")
+        f.write("-- 导出时间: " + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + "\n\n")
+        
+        # 与export_sql.py相同，整个脚本在一个事务中执行，导入时只提交一次
+        f.write("BEGIN TRANSACTION;\n\n")
+        
+        # 创建表结构
+        f.write("""CREATE TABLE IF NOT EXISTS study_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL,
+    start_time DATETIME NOT NULL,
+    end_time DATETIME,
+    timer_type TEXT NOT NULL,
+    planned_duration INTEGER NOT NULL,
+    actual_duration INTEGER,
+    completed BOOLEAN DEFAULT FALSE,
+    notes TEXT,
+    todo_id INTEGER,
+    todo_content TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);\n\n""")
+        
+        # 插入数据，每条INSERT语句写入一批记录
+        f.write("-- 插入学习记录数据\n")
+        rows = []
+        for row in values:
+            rows.append(row)
+            if len(rows) == SQL_INSERT_BATCH_SIZE:
+                f.write(_SQL_INSERT_PREFIX + ",\n".join(rows) + ";\n")
+                rows = []
+        if rows:
+            f.write(_SQL_INSERT_PREFIX + ",\n".join(rows) + ";\n")
+        
+        f.write("COMMIT;\n")
+
+
+def _write_excel_export(rows: Iterator[tuple], file_path: str):
+    """
+    导出为Excel表格
+    
+    Args:
+        rows: 按_EXCEL_COLUMNS排列的记录值元组，由Database.iter_session_rows生成
+        file_path: 导出文件路径
+    """
+    headers = [header for _, header in _EXCEL_COLUMNS]
+    if XLSXWRITER_AVAILABLE:
+        # 使用constant_memory模式逐行写入，不在内存中保留整个工作簿
+        workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+        try:
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, headers)
+            for row_index, row in enumerate(rows, 1):
+                worksheet.write_row(row_index, 0, row)
+        finally:
+            workbook.close()
+        return
+    
+    # 未安装xlsxwriter时使用openpyxl的只写模式，同样逐行写入磁盘
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(headers)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(file_path)
+
+
+# 导出格式 -> (对话框标题, 扩展名, 文件过滤器, 写入函数)
+_EXPORT_FORMATS = {
+    "json": ("导出JSON数据", "json", "JSON文件 (*.json);;JSON压缩文件 (*.json.gz)", _write_json_export),
+    "sql": ("导出SQL脚本", "sql", "SQL文件 (*.sql);;SQL压缩文件 (*.sql.gz)", _write_sql_export),
+    "excel": ("导出Excel表格", "xlsx", "Excel文件 (*.xlsx)", _write_excel_export),
+}
+
+
+class ExportWorker(QObject):
+    """数据导出工作对象，在独立线程中读取学习记录并写入文件"""
+    
+    # 已导出记录数, 总记录数
+    progress = pyqtSignal(int, int)
+    # 导出文件路径
+    finished = pyqtSignal(str)
+    # 错误信息
+    error = pyqtSignal(str)
+    
+    def __init__(self, database, format_type: str, file_path: str):
+        super().__init__()
+        self.database = database
+        self.format_type = format_type
+        self.file_path = file_path
+    
+    def run(self):
+        """执行导出"""
+        conn = None
+        try:
+            # 使用独立的只读连接，不与界面线程共用数据库连接
+            conn = self.database.open_readonly_connection()
+            total = self.database.count_sessions(conn)
+            self.progress.emit(0, total)
+            
+            if self.format_type == "sql":
+                # SQL脚本的字面量由sqlite直接生成
+                rows = self.database.iter_session_values(_SQL_EXPORT_COLUMNS, EXPORT_BATCH_SIZE, conn)
+            elif self.format_type == "json":
+                rows = self.database.iter_session_rows(_JSON_EXPORT_COLUMNS, EXPORT_BATCH_SIZE, conn,
+                                                       _JSON_EXPORT_DEFAULTS)
+            else:
+                rows = self.database.iter_session_rows(_EXCEL_EXPORT_KEYS, EXPORT_BATCH_SIZE, conn)
+            write = _EXPORT_FORMATS[self.format_type][3]
+            write(self._report_progress(rows, total), self.file_path)
+            self.finished.emit(self.file_path)
+        
+        except Exception as e:
+            logger.error(f"导出数据失败: {e}")
+            self.error.emit(str(e))
+        
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    def _report_progress(self, rows: Iterator, total: int) -> Iterator:
+        """透传记录，每处理EXPORT_PROGRESS_STEP条发送一次进度"""
+        for count, row in enumerate(rows, 1):
+            yield row
+            if count % EXPORT_PROGRESS_STEP == 0:
+                self.progress.emit(count, total)
+
+
+class _ImportFormatError(Exception):
+    """导入文件内容不符合要求"""
+
+
+def _import_json_file(database, file_path: str) -> int:
+    """
+    导入JSON数据
+    
+    Returns:
+        成功导入的记录数
+    """
+    with open(file_path, 'rb') as f:
+        if IJSON_AVAILABLE:
+            # 逐条解析记录，不把整个文件载入内存
+            events = ijson.parse(f, use_float=True)
+            first_event = next(events)
+            is_array = first_event[1] == 'start_array'
+            records = ijson.items(itertools.chain([first_event], events), 'item')
+        else:
+            records = json.loads(f.read().decode('utf-8'))
+            is_array = isinstance(records, list)
+        
+        # 验证数据格式
+        if not is_array:
+            raise _ImportFormatError("JSON文件应包含学习记录数组")
+        
+        return _import_json_records(database, records)
+
+
+def _import_json_records(database, records) -> int:
+    """
+    把JSON记录分批写入数据库
+    
+    Args:
+        records: JSON记录迭代器
+        
+    Returns:
+        成功导入的记录数
+    """
+    imported_count = 0
+    sessions = []
+    for record in records:
+        # 验证必需字段
+        required_fields = ['date', 'start_time', 'end_time']
+        if not all(field in record for field in required_fields):
+            # 兼容旧格式
+            old_required_fields = ['日期', '开始时间', '结束时间']
+            if not all(field in record for field in old_required_fields):
+                continue
+            # 转换旧格式到新格式
+            record['date'] = record['日期']
+            record['start_time'] = record['开始时间']
+            record['end_time'] = record['结束时间']
+
+        # 计算持续时间（分钟）
+        duration_minutes = 0
+        if 'actual_duration' in record:
+            # 使用actual_duration字段（秒）
+            duration_minutes = record['actual_duration'] / 60
+        elif '实际时长(秒)' in record:
+            # 兼容旧格式（秒转换为分钟）
+            duration_minutes = record['实际时长(秒)'] / 60
+        elif 'actual_duration' in record:
+            # 兼容旧格式（秒转换为分钟）
+            duration_minutes = record['actual_duration'] / 60 if record['actual_duration'] else 0
+        elif '实际时长(分钟)' in record:
+            duration_minutes = record['实际时长(分钟)']
+        elif '计划时长(分钟)' in record:
+            duration_minutes = record['计划时长(分钟)']
+        elif '时长(分钟)' in record:
+            duration_minutes = record['时长(分钟)']
+
+        # 收集记录参数，包含所有字段
+        sessions.append((
+            record['date'],
+            record['start_time'],
+            record['end_time'],
+            duration_minutes,
+            record.get('notes', record.get('备注', '')),
+            record.get('todo_id', record.get('关联待办ID')),
+            record.get('timer_type', record.get('计时器类型', 'study')),
+            record.get('planned_duration'),
+            record.get('actual_duration'),
+            record.get('completed', True),
+            record.get('todo_content', ''),
+            record.get('id')
+        ))
+        
+        # 每攒够一批在一个事务中写入数据库
+        if len(sessions) >= IMPORT_BATCH_SIZE:
+            imported_count += database.add_sessions_bulk(sessions)
+            sessions = []
+    
+    imported_count += database.add_sessions_bulk(sessions)
+    return imported_count
+
+
+def _import_excel_file(database, file_path: str) -> int:
+    """
+    导入Excel数据
+    
+    Returns:
+        成功导入的记录数
+    """
+    import pandas as pd
+    
+    # 读取Excel文件
+    df = pd.read_excel(file_path)
+    
+    # 验证必需列
+    required_columns = ['日期', '开始时间', '结束时间']
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    
+    if missing_columns:
+        # 检查是否是英文列名
+        english_required_columns = ['date', 'start_time', 'end_time']
+        missing_english_columns = [col for col in english_required_columns if col not in df.columns]
+        
+        if missing_english_columns:
+            raise _ImportFormatError(f"Excel文件缺少必需列: {', '.join(missing_columns)} 或 {', '.join(missing_english_columns)}")
+        else:
+            # 重命名英文列名为中文
+            df = df.rename(columns={
+                'date': '日期',
+                'start_time': '开始时间',
+                'end_time': '结束时间',
+                'notes': '备注',
+                'todo_id': '关联待办ID',
+                'todo_content': '待办内容',
+                'timer_type': '计时器类型',
+                'planned_duration': '计划时长(秒)',
+                'actual_duration': '实际时长(秒)',
+                'completed': '已完成',
+                'id': 'ID'
+            })
+    
+    # 按列整体转换格式，不再逐行构造Series
+    columns = df.columns
+    
+    def text_column(name, default):
+        return df[name].astype(str).tolist() if name in columns else [default] * len(df)
+    
+    # 数值列中无法转换为数字的记录与原来一样导入失败，整行跳过
+    invalid = pd.Series(False, index=df.index)
+    
+    def int_column(name):
+        nonlocal invalid
+        if name not in columns:
+            return [None] * len(df)
+        values = pd.to_numeric(df[name], errors='coerce')
+        invalid |= values.isna()
+        return values.fillna(0).astype('int64').tolist()
+    
+    # 处理日期格式
+    date_strs = df['日期'].map(_excel_date_str)
+    invalid |= date_strs.isna()
+    
+    # 计算持续时间（分钟），按优先级取第一个存在的列
+    duration_minutes = pd.Series(0.0, index=df.index)
+    for name, scale in (('实际时长(秒)', 60), ('actual_duration', 60), ('实际时长(分钟)', 1),
+                        ('计划时长(分钟)', 1), ('时长(分钟)', 1)):
+        if name in columns:
+            duration_minutes = pd.to_numeric(df[name], errors='coerce') / scale
+            break
+    
+    planned_durations = int_column('计划时长(秒)')
+    actual_durations = int_column('实际时长(秒)')
+    ids = int_column('ID')
+    completed = df['已完成'].astype(bool).tolist() if '已完成' in columns else [True] * len(df)
+    todo_ids = df['关联待办ID'].tolist() if '关联待办ID' in columns else [None] * len(df)
+    
+    sessions = [
+        session for session, skip in zip(zip(
+            date_strs.tolist(),
+            text_column('开始时间', ''),
+            text_column('结束时间', ''),
+            duration_minutes.tolist(),
+            text_column('备注', ''),
+            todo_ids,
+            text_column('计时器类型', 'study'),
+            planned_durations,
+            actual_durations,
+            completed,
+            text_column('待办内容', ''),
+            ids
+        ), invalid.tolist()) if not skip
+    ]
+    skipped = len(df) - len(sessions)
+    if skipped:
+        logger.warning(f"导入记录失败: {skipped} 条记录的日期或时长格式无效")
+    
+    # 在一个事务中批量插入数据库
+    return database.add_sessions_bulk(sessions)
+
+
+# 导入格式 -> 导入函数
+_IMPORTERS = {
+    "json": _import_json_file,
+    "excel": _import_excel_file,
+}
+
+
+class ImportWorker(QObject):
+    """数据导入工作对象，在独立线程中读取文件并写入学习记录"""
+    
+    # 成功导入的记录数
+    finished = pyqtSignal(int)
+    # 错误标题, 错误信息
+    error = pyqtSignal(str, str)
+    
+    def __init__(self, database, format_type: str, file_path: str):
+        super().__init__()
+        self.db_file = database.db_file
+        self.format_type = format_type
+        self.file_path = file_path
+    
+    def run(self):
+        """执行导入"""
+        database = None
+        try:
+            # 使用独立的数据库连接，导入事务不与界面线程的操作交错
+            database = Database(self.db_file)
+            imported_count = _IMPORTERS[self.format_type](database, self.file_path)
+            self.finished.emit(imported_count)
+        
+        except _ImportFormatError as e:
+            self.error.emit("格式错误", str(e))
+        except _JSON_ERRORS:
+            self.error.emit("格式错误", "无效的JSON文件格式")
+        except ImportError:
+            self.error.emit("缺少依赖", "导入Excel需要安装pandas和openpyxl库，请使用pip安装：\npip install pandas openpyxl")
+        except Exception as e:
+            logger.error(f"导入数据失败: {e}")
+            self.error.emit("导入失败", f"导入数据失败: {e}")
+        
+        finally:
+            if database is not None:
+                database.close()
 
 
 class TimerTypeDialog(QDialog):
@@ -50,6 +568,12 @@ class TimerTypeDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addRow(button_box)
     
+    def reset(self, name="", duration=0):
+        """重置输入内容，以便复用对话框"""
+        self.name_edit.setText(name)
+        self.duration_spin.setValue(duration // 60)  # 秒转分钟
+        self.name_edit.setFocus()
+    
     def get_values(self):
         """获取输入值"""
         return {
@@ -58,23 +582,171 @@ class TimerTypeDialog(QDialog):
         }
 
 
+class TimerTypeModel(QAbstractListModel):
+    """计时器类型列表模型"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        # 每行的显示文本，在数据变化时生成（不写入计时器类型字典，避免被保存到配置文件）
+        self._labels = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.DisplayRole:
+            return self._labels[index.row()]
+        if role == Qt.UserRole:
+            # 只返回ID，完整数据通过row_data按行号获取，避免字典装箱为QVariant
+            return self._rows[index.row()]['id']
+        return None
+    
+    @staticmethod
+    def _make_label(timer_type: Dict) -> str:
+        """生成计时器类型的显示文本"""
+        return _LABEL_TMPL(timer_type['name'], timer_type['duration'] // 60)
+    
+    def set_rows(self, timer_types: List[Dict]):
+        """重置全部计时器类型"""
+        self.beginResetModel()
+        self._rows = list(timer_types)
+        self._labels = [self._make_label(t) for t in self._rows]
+        self.endResetModel()
+    
+    def row_data(self, row: int) -> Dict:
+        """获取指定行的计时器类型"""
+        return self._rows[row]
+    
+    def type_ids(self) -> tuple:
+        """获取所有计时器类型的ID"""
+        return tuple(t['id'] for t in self._rows)
+    
+    def append_row(self, timer_type: Dict):
+        """在末尾添加一个计时器类型"""
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(timer_type)
+        self._labels.append(self._make_label(timer_type))
+        self.endInsertRows()
+    
+    def refresh_row(self, row: int):
+        """通知视图指定行的计时器类型已修改"""
+        self._labels[row] = self._make_label(self._rows[row])
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def remove_row(self, row: int):
+        """删除指定行的计时器类型"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._labels[row]
+        self.endRemoveRows()
+
+
+class _SaveSettingsTask(QRunnable):
+    """在线程池中把已序列化的配置写入文件"""
+    
+    def __init__(self, settings, content: str, finished):
+        super().__init__()
+        self._settings = settings
+        self._content = content
+        self._finished = finished
+    
+    def run(self):
+        self._finished.emit(self._settings.save(self._content))
+
+
+class _PreloadModuleTask(QRunnable):
+    """在线程池中预先导入耗时较长的可选模块"""
+    
+    def __init__(self, module_name: str):
+        super().__init__()
+        self._module_name = module_name
+    
+    def run(self):
+        try:
+            importlib.import_module(self._module_name)
+        except ImportError:
+            # 未安装时由实际使用处提示
+            pass
+
+
 class SettingsWidget(QWidget):
     """设置页面组件"""
     
     # 设置变更信号
     settings_changed = pyqtSignal(str, object)
     
+    # 后台保存完成信号（是否成功）
+    _save_finished = pyqtSignal(bool)
+    
+    # 设置页面读取的配置键及默认值
+    _SETTINGS_KEYS = (
+        ('timer.auto_switch', False),
+        ('notification.sound.enabled', True),
+        ('notification.sound.file', ''),
+        ('notification.popup.enabled', True),
+        ('notification.show_main_window', True),
+        ('ui.background_image', ''),
+        ('ui.background_mode', 'stretch'),
+    )
+    
     def __init__(self, settings, database, parent=None):
         super().__init__(parent)
         self.settings = settings
         self.database = database
-        self.logger = logging.getLogger(__name__)
+        
+        # 合并短时间内的多次保存，只写一次文件
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(200)
+        self._save_timer.timeout.connect(self._flush_save)
+        self._save_finished.connect(self._on_save_finished)
+        
+        # 非模态提示条，用于导出完成等不需要用户确认的消息
+        self._toast = QLabel(self)
+        self._toast.setStyleSheet("background-color: rgba(44, 62, 80, 220); color: white;"
+                                  "padding: 8px 16px; border-radius: 4px;")
+        self._toast.hide()
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.timeout.connect(self._toast.hide)
+        
+        # 上次导入音频/壁纸时所在的目录，下次打开对话框时从这里开始
+        self._last_sound_dir = ""
+        self._last_wallpaper_dir = ""
+        
+        # 最近一次加载或保存时的设置值，用于跳过没有变化的保存
+        self._saved_values = None
+        # 计时器类型在内存中已修改但尚未写入文件
+        self._timer_types_dirty = False
+        
+        # 配置键 -> (读取控件值, 设置控件值)，重置时只更新值有变化的控件
+        self._widget_map = {}
+        
+        # 计时器类型编辑对话框，首次使用时创建
+        self._timer_dialog = None
+        # 导出保存对话框，首次导出时创建
+        self._save_dialog = None
+        
+        # 提醒选项卡在首次选中时才构建
+        self._notification_tab_built = False
+        # 首次打开数据管理选项卡时在后台预先导入pandas
+        self._pandas_preloaded = False
+        
+        # 正在进行的后台导出/导入
+        self._data_buttons = ()
+        self._data_thread = None
+        self._data_worker = None
+        self._data_progress = None
         
         self._build_ui()
         # 确保UI完全构建后再加载设置
         self._load_settings()
-        # 加载音频文件列表
-        self._load_sound_files()
     
     def _build_ui(self):
         """构建界面"""
@@ -96,7 +768,7 @@ class SettingsWidget(QWidget):
         timer_layout = QVBoxLayout(timer_tab)
         
         # 创建数据管理选项卡
-        data_tab = QWidget()
+        data_tab = self._data_tab = QWidget()
         data_layout = QVBoxLayout(data_tab)
         
         # 计时器类型管理
@@ -104,8 +776,12 @@ class SettingsWidget(QWidget):
         timer_group_layout = QVBoxLayout(timer_group)
         
         # 计时器类型列表
-        self.timer_list = QListWidget()
+        self.timer_model = TimerTypeModel(self)
+        self.timer_list = QListView()
+        self.timer_list.setModel(self.timer_model)
         self.timer_list.setAlternatingRowColors(True)
+        # 每行都是单行文本，统一行高后视图无需逐行测量尺寸
+        self.timer_list.setUniformItemSizes(True)
         timer_group_layout.addWidget(self.timer_list)
         
         # 计时器类型操作按钮
@@ -132,6 +808,7 @@ class SettingsWidget(QWidget):
         
         self.auto_switch_check = QCheckBox("完成后自动切换到下一个计时器")
         auto_switch_layout.addWidget(self.auto_switch_check)
+        self._widget_map['timer.auto_switch'] = (self.auto_switch_check.isChecked, self.auto_switch_check.setChecked)
         
         timer_layout.addWidget(auto_switch_group)
         
@@ -150,19 +827,19 @@ class SettingsWidget(QWidget):
         # JSON导出按钮
         json_export_btn = QPushButton("导出为JSON")
         json_export_btn.setIcon(QIcon.fromTheme("document-save"))
-        json_export_btn.clicked.connect(lambda: self._export_data("json"))
+        json_export_btn.clicked.connect(partial(self._export_data, "json"))
         export_buttons_layout.addWidget(json_export_btn)
         
         # SQL导出按钮
         sql_export_btn = QPushButton("导出为SQL脚本")
         sql_export_btn.setIcon(QIcon.fromTheme("text-x-script"))
-        sql_export_btn.clicked.connect(lambda: self._export_data("sql"))
+        sql_export_btn.clicked.connect(partial(self._export_data, "sql"))
         export_buttons_layout.addWidget(sql_export_btn)
         
         # Excel导出按钮
         excel_export_btn = QPushButton("导出为Excel")
         excel_export_btn.setIcon(QIcon.fromTheme("x-office-spreadsheet"))
-        excel_export_btn.clicked.connect(lambda: self._export_data("excel"))
+        excel_export_btn.clicked.connect(partial(self._export_data, "excel"))
         export_buttons_layout.addWidget(excel_export_btn)
         
         data_export_layout.addLayout(export_buttons_layout)
@@ -182,7 +859,7 @@ class SettingsWidget(QWidget):
         
         excel_template_btn = QPushButton("Excel模板")
         excel_template_btn.setIcon(QIcon.fromTheme("x-office-spreadsheet"))
-        excel_template_btn.clicked.connect(lambda: self._download_template("excel"))
+        excel_template_btn.clicked.connect(partial(self._download_template, "excel"))
         template_layout.addWidget(excel_template_btn)
         
         template_layout.addStretch()
@@ -193,7 +870,7 @@ class SettingsWidget(QWidget):
         # JSON导入按钮
         json_import_btn = QPushButton("导入JSON文件")
         json_import_btn.setIcon(QIcon.fromTheme("document-open"))
-        json_import_btn.clicked.connect(lambda: self._import_data("json"))
+        json_import_btn.clicked.connect(partial(self._import_data, "json"))
         import_buttons_layout.addWidget(json_import_btn)
         
 
@@ -201,50 +878,19 @@ class SettingsWidget(QWidget):
         # Excel导入按钮
         excel_import_btn = QPushButton("导入Excel文件")
         excel_import_btn.setIcon(QIcon.fromTheme("x-office-spreadsheet"))
-        excel_import_btn.clicked.connect(lambda: self._import_data("excel"))
+        excel_import_btn.clicked.connect(partial(self._import_data, "excel"))
         import_buttons_layout.addWidget(excel_import_btn)
         
+        # 后台导出/导入期间禁用的按钮
+        self._data_buttons = (json_export_btn, sql_export_btn, excel_export_btn,
+                              json_import_btn, excel_import_btn)
+        
         data_import_layout.addLayout(import_buttons_layout)
         data_layout.addWidget(data_import_group)
         
-        # 创建提醒设置选项卡
-        notification_tab = QWidget()
-        notification_layout = QVBoxLayout(notification_tab)
-        
-        # 声音提醒设置
-        sound_group = QGroupBox("声音提醒")
-        sound_layout = QFormLayout(sound_group)
-        
-        self.sound_enabled_check = QCheckBox("启用声音提醒")
-        sound_layout.addRow(self.sound_enabled_check)
-        
-        # 音频文件选择布局
-        sound_file_layout = QHBoxLayout()
-        self.sound_file_combo = QComboBox()
-        self.sound_file_combo.setEditable(False)
-        sound_file_layout.addWidget(self.sound_file_combo)
-        
-        self.import_sound_btn = QPushButton("导入音频")
-        self.import_sound_btn.clicked.connect(self._import_sound_file)
-        sound_file_layout.addWidget(self.import_sound_btn)
-        
-        sound_layout.addRow("提醒音乐:", sound_file_layout)
-        notification_layout.addWidget(sound_group)
-        
-        # 弹窗提醒设置
-        popup_group = QGroupBox("弹窗提醒")
-        popup_layout = QVBoxLayout(popup_group)
-        
-        self.popup_enabled_check = QCheckBox("启用弹窗提醒")
-        popup_layout.addWidget(self.popup_enabled_check)
-        
-        self.show_main_window_check = QCheckBox("计时结束后显示主窗口")
-        popup_layout.addWidget(self.show_main_window_check)
-        
-        notification_layout.addWidget(popup_group)
-        
-        # 添加提醒选项卡
-        self.tab_widget.addTab(notification_tab, "提醒")
+        # 添加提醒选项卡（占位，首次选中时构建内容）
+        self._notification_tab = QWidget()
+        self.tab_widget.addTab(self._notification_tab, "提醒")
         
         # 添加数据管理选项卡
         self.tab_widget.addTab(data_tab, "数据管理")
@@ -278,6 +924,11 @@ class SettingsWidget(QWidget):
         self.background_mode_combo = QComboBox()
         self.background_mode_combo.addItems(["拉伸填充", "适应窗口", "平铺", "填充窗口"])
         self.background_mode_combo.setCurrentText("拉伸填充")
+        self._widget_map.update({
+            'ui.background_image': (lambda: self._combo_path(self.background_file_combo, "wallpaper"),
+                                    lambda path: self._select_combo_path(self.background_file_combo, path)),
+            'ui.background_mode': (self._background_mode, self._set_background_mode)
+        })
         background_mode_layout.addWidget(self.background_mode_combo)
         
         background_mode_layout.addStretch()
@@ -316,8 +967,69 @@ class SettingsWidget(QWidget):
         buttons_layout.addWidget(self.save_btn)
         
         main_layout.addLayout(buttons_layout)
+        
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
+    
+    def _ensure_tab_built(self, index: int):
+        """选项卡切换处理，首次选中提醒选项卡时构建其内容"""
+        tab = self.tab_widget.widget(index)
+        if not self._notification_tab_built and tab is self._notification_tab:
+            self._build_notification_tab(self._notification_tab)
+        elif not self._pandas_preloaded and tab is self._data_tab:
+            # Excel导入和模板需要pandas，导入耗时较长，打开数据管理选项卡时提前在后台导入
+            self._pandas_preloaded = True
+            QThreadPool.globalInstance().start(_PreloadModuleTask("pandas"))
+    
+    def _build_notification_tab(self, container: QWidget):
+        """构建提醒设置选项卡"""
+        notification_layout = QVBoxLayout(container)
+        
+        # 声音提醒设置
+        sound_group = QGroupBox("声音提醒")
+        sound_layout = QFormLayout(sound_group)
+        
+        self.sound_enabled_check = QCheckBox("启用声音提醒")
+        sound_layout.addRow(self.sound_enabled_check)
+        
+        # 音频文件选择布局
+        sound_file_layout = QHBoxLayout()
+        self.sound_file_combo = QComboBox()
+        self.sound_file_combo.setEditable(False)
+        sound_file_layout.addWidget(self.sound_file_combo)
+        
+        self.import_sound_btn = QPushButton("导入音频")
+        self.import_sound_btn.clicked.connect(self._import_sound_file)
+        sound_file_layout.addWidget(self.import_sound_btn)
+        
+        sound_layout.addRow("提醒音乐:", sound_file_layout)
+        notification_layout.addWidget(sound_group)
+        
+        # 弹窗提醒设置
+        popup_group = QGroupBox("弹窗提醒")
+        popup_layout = QVBoxLayout(popup_group)
+        
+        self.popup_enabled_check = QCheckBox("启用弹窗提醒")
+        popup_layout.addWidget(self.popup_enabled_check)
+        
+        self.show_main_window_check = QCheckBox("计时结束后显示主窗口")
+        popup_layout.addWidget(self.show_main_window_check)
+        
+        notification_layout.addWidget(popup_group)
+        
+        self._widget_map.update({
+            'notification.sound.enabled': (self.sound_enabled_check.isChecked, self.sound_enabled_check.setChecked),
+            'notification.sound.file': (lambda: self._combo_path(self.sound_file_combo, "sounds"),
+                                        lambda path: self._select_combo_path(self.sound_file_combo, path)),
+            'notification.popup.enabled': (self.popup_enabled_check.isChecked, self.popup_enabled_check.setChecked),
+            'notification.show_main_window': (self.show_main_window_check.isChecked, self.show_main_window_check.setChecked)
+        })
+        
+        self._notification_tab_built = True
+        self._load_notification_settings(self.settings.get_many(self._SETTINGS_KEYS))
+        if self._saved_values is not None:
+            self._saved_values.update(self._collect_notification_values())
     
-    def _download_template(self, format_type):
+    def _download_template(self, format_type, _checked=False):
         """下载数据模板文件"""
         try:
             if format_type == "excel":
@@ -352,7 +1064,7 @@ class SettingsWidget(QWidget):
                         QMessageBox.warning(self, "缺少依赖", "Excel模板功能需要安装pandas和openpyxl库")
         
         except Exception as e:
-            self.logger.error(f"下载模板失败: {e}")
+            logger.error(f"下载模板失败: {e}")
             QMessageBox.critical(self, "下载失败", f"下载模板时发生错误: {str(e)}")
     
     def _load_settings(self):
@@ -361,109 +1073,161 @@ class SettingsWidget(QWidget):
             # 加载计时器类型
             self._load_timer_types()
             
-            # 加载自动切换设置
-            auto_switch = self.settings.get('timer.auto_switch', False)
-            self.auto_switch_check.setChecked(auto_switch)
+            values = self.settings.get_many(self._SETTINGS_KEYS)
             
+            # 填充控件期间屏蔽信号，最后统一更新一次背景预览
+            blockers = [QSignalBlocker(w) for w in
+                        (self.auto_switch_check, self.background_file_combo, self.background_mode_combo)]
+            try:
+                # 加载自动切换设置
+                self.auto_switch_check.setChecked(values['timer.auto_switch'])
+                
+                # 加载提醒设置（提醒选项卡已构建时）
+                if self._notification_tab_built:
+                    self._load_notification_settings(values)
+                
+                # 加载背景图片设置（预览在选中保存的图片后统一更新）
+                self._load_background_files(update_preview=False)
+                
+                # 设置当前选中的背景图片（列表来自壁纸目录，能找到即文件存在）
+                background_image = values['ui.background_image']
+                if background_image:
+                    filename = os.path.basename(background_image)
+                    index = self.background_file_combo.findText(filename)
+                    if index >= 0:
+                        self.background_file_combo.setCurrentIndex(index)
+                
+                # 设置背景显示模式
+                self._set_background_mode(values['ui.background_mode'])
+            finally:
+                for blocker in blockers:
+                    blocker.unblock()
+            
+            # 更新背景预览
+            self._update_background_preview()
+            
+            # 记录当前设置，用于判断保存时是否有变化
+            self._saved_values = self._collect_values()
+            
+        except Exception as e:
+            logger.error(f"加载设置失败: {e}")
+    
+    def _load_notification_settings(self, values: Dict):
+        """加载提醒选项卡中的设置"""
+        # 填充控件期间屏蔽信号
+        blockers = [QSignalBlocker(w) for w in
+                    (self.sound_enabled_check, self.sound_file_combo,
+                     self.popup_enabled_check, self.show_main_window_check)]
+        try:
             # 加载声音提醒设置
-            sound_enabled = self.settings.get('notification.sound.enabled', True)
-            self.sound_enabled_check.setChecked(sound_enabled)
+            self.sound_enabled_check.setChecked(values['notification.sound.enabled'])
             
             # 加载音频文件列表
             self._load_sound_files()
             
-            # 设置当前选中的音频文件
-            sound_file = self.settings.get('notification.sound.file', '')
-            if sound_file and os.path.exists(sound_file):
+            # 设置当前选中的音频文件（列表来自音频目录，能找到即文件存在）
+            sound_file = values['notification.sound.file']
+            if sound_file:
                 filename = os.path.basename(sound_file)
                 index = self.sound_file_combo.findText(filename)
                 if index >= 0:
                     self.sound_file_combo.setCurrentIndex(index)
             
             # 加载弹窗提醒设置
-            popup_enabled = self.settings.get('notification.popup.enabled', True)
-            self.popup_enabled_check.setChecked(popup_enabled)
+            self.popup_enabled_check.setChecked(values['notification.popup.enabled'])
             
             # 加载计时结束后显示主窗口设置
-            show_main_window = self.settings.get('notification.show_main_window', True)
-            self.show_main_window_check.setChecked(show_main_window)
-            
-            # 加载背景图片设置
-            self._load_background_files()
-            
-            # 设置当前选中的背景图片
-            background_image = self.settings.get('ui.background_image', '')
-            if background_image and os.path.exists(background_image):
-                filename = os.path.basename(background_image)
-                index = self.background_file_combo.findText(filename)
-                if index >= 0:
-                    self.background_file_combo.setCurrentIndex(index)
-            
-            # 设置背景显示模式
-            background_mode = self.settings.get('ui.background_mode', 'stretch')
-            mode_map = {'stretch': '拉伸填充', 'fit': '适应窗口', 'tile': '平铺', 'fill': '填充窗口'}
-            mode_text = mode_map.get(background_mode, '拉伸填充')
-            index = self.background_mode_combo.findText(mode_text)
-            if index >= 0:
-                self.background_mode_combo.setCurrentIndex(index)
-            
-            # 更新背景预览
-            self._update_background_preview()
-            
-        except Exception as e:
-            self.logger.error(f"加载设置失败: {e}")
+            self.show_main_window_check.setChecked(values['notification.show_main_window'])
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+    
+    @staticmethod
+    def _combo_path(combo: QComboBox, resource_dir: str) -> str:
+        """获取下拉框中选中的资源文件完整路径，未选择时返回空字符串"""
+        selected = combo.currentText()
+        if not selected:
+            return ''
+        # 构建完整文件路径
+        return os.path.join(_RESOURCES_DIR, resource_dir, selected)
+    
+    @staticmethod
+    def _select_combo_path(combo: QComboBox, path: str):
+        """在下拉框中选中指定文件，不在列表中时选中第一项"""
+        index = combo.findText(os.path.basename(path)) if path else -1
+        combo.setCurrentIndex(max(index, 0))
+    
+    def _background_mode(self) -> str:
+        """获取选中的背景显示模式"""
+        mode_map = {'拉伸填充': 'stretch', '适应窗口': 'fit', '平铺': 'tile', '填充窗口': 'fill'}
+        return mode_map.get(self.background_mode_combo.currentText(), 'stretch')
+    
+    def _set_background_mode(self, mode: str):
+        """选中指定的背景显示模式"""
+        mode_map = {'stretch': '拉伸填充', 'fit': '适应窗口', 'tile': '平铺', 'fill': '填充窗口'}
+        index = self.background_mode_combo.findText(mode_map.get(mode, '拉伸填充'))
+        if index >= 0:
+            self.background_mode_combo.setCurrentIndex(index)
+    
+    def _collect_values(self) -> Dict:
+        """根据界面控件状态生成要保存的设置"""
+        values = {
+            'timer.auto_switch': self.auto_switch_check.isChecked(),
+            'ui.background_image': self._combo_path(self.background_file_combo, "wallpaper"),
+            'ui.background_mode': self._background_mode()
+        }
+        
+        # 提醒选项卡未打开过时，提醒设置保持不变
+        if self._notification_tab_built:
+            values.update(self._collect_notification_values())
+        return values
+    
+    def _collect_notification_values(self) -> Dict:
+        """根据提醒选项卡的控件状态生成要保存的设置"""
+        return {
+            'notification.sound.enabled': self.sound_enabled_check.isChecked(),
+            'notification.sound.file': self._combo_path(self.sound_file_combo, "sounds"),
+            'notification.popup.enabled': self.popup_enabled_check.isChecked(),
+            'notification.show_main_window': self.show_main_window_check.isChecked()
+        }
     
     def _save_settings(self):
         """保存设置"""
         try:
-            # 保存自动切换设置
-            self.settings.set('timer.auto_switch', self.auto_switch_check.isChecked())
-            
-            # 保存声音提醒设置
-            self.settings.set('notification.sound.enabled', self.sound_enabled_check.isChecked())
-            
-            # 保存选中的音频文件完整路径
-            selected_file = self.sound_file_combo.currentText()
-            if selected_file:
-                # 构建完整文件路径
-                sounds_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "sounds")
-                full_path = os.path.join(sounds_dir, selected_file)
-                self.settings.set('notification.sound.file', full_path)
-            else:
-                self.settings.set('notification.sound.file', '')
+            values = self._collect_values()
             
-            # 保存弹窗提醒设置
-            self.settings.set('notification.popup.enabled', self.popup_enabled_check.isChecked())
-            self.settings.set('notification.show_main_window', self.show_main_window_check.isChecked())
-            
-            # 保存背景图片设置
-            selected_background = self.background_file_combo.currentText()
-            if selected_background:
-                # 构建完整文件路径
-                wallpaper_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "wallpaper")
-                full_path = os.path.join(wallpaper_dir, selected_background)
-                self.settings.set('ui.background_image', full_path)
-            else:
-                self.settings.set('ui.background_image', '')
+            # 设置和计时器类型都没有变化时不再写入文件
+            if values == self._saved_values and not self._timer_types_dirty:
+                QMessageBox.information(self, "保存成功", "设置已保存")
+                return
             
-            # 保存背景显示模式
-            mode_text = self.background_mode_combo.currentText()
-            mode_map = {'拉伸填充': 'stretch', '适应窗口': 'fit', '平铺': 'tile', '填充窗口': 'fill'}
-            mode_value = mode_map.get(mode_text, 'stretch')
-            self.settings.set('ui.background_mode', mode_value)
+            # 一次性写入所有设置
+            self.settings.update(values)
+            self._saved_values = values
+            self._timer_types_dirty = False
             
-            # 保存设置到文件
-            self.settings.save()
+            # 稍后在后台保存设置到文件
+            self._save_timer.start()
             
             # 发送设置变更信号
             self.settings_changed.emit("all", None)
             
-            QMessageBox.information(self, "保存成功", "设置已保存")
-            
         except Exception as e:
-            self.logger.error(f"保存设置失败: {e}")
+            logger.error(f"保存设置失败: {e}")
             QMessageBox.critical(self, "保存失败", f"保存设置失败: {e}")
     
+    def _flush_save(self):
+        """把设置写入文件（在界面线程序列化，在线程池中写入）"""
+        content = self.settings.to_json()
+        QThreadPool.globalInstance().start(_SaveSettingsTask(self.settings, content, self._save_finished))
+    
+    def _on_save_finished(self, success: bool):
+        """后台保存完成处理"""
+        if success:
+            QMessageBox.information(self, "保存成功", "设置已保存")
+        else:
+            QMessageBox.critical(self, "保存失败", "保存设置失败，请查看日志")
+    
     def _reset_settings(self):
         """重置为默认设置"""
         reply = QMessageBox.question(self, "确认重置", "确定要重置所有设置为默认值吗？",
@@ -471,11 +1235,24 @@ class SettingsWidget(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
+                type_ids = self.timer_model.type_ids()
+                
                 # 重置设置
                 self.settings.reset_to_defaults()
+                values = self.settings.get_many(self._SETTINGS_KEYS)
+                
+                # 只更新值有变化的控件
+                for key, (get_value, set_value) in self._widget_map.items():
+                    if get_value() != values[key]:
+                        set_value(values[key])
                 
-                # 重新加载设置
-                self._load_settings()
+                # 计时器类型有变化时才重新加载列表
+                if tuple(t['id'] for t in self.settings.get_timer_types()) != type_ids:
+                    self._load_timer_types()
+                
+                # 重置后的设置已写入文件
+                self._saved_values = self._collect_values()
+                self._timer_types_dirty = False
                 
                 # 发送设置变更信号
                 self.settings_changed.emit("all", None)
@@ -483,12 +1260,19 @@ class SettingsWidget(QWidget):
                 QMessageBox.information(self, "重置成功", "设置已重置为默认值")
                 
             except Exception as e:
-                self.logger.error(f"重置设置失败: {e}")
+                logger.error(f"重置设置失败: {e}")
                 QMessageBox.critical(self, "重置失败", f"重置设置失败: {e}")
     
+    def _get_timer_dialog(self, name="", duration=0) -> TimerTypeDialog:
+        """获取重置后的计时器类型对话框（添加和编辑共用一个实例）"""
+        if self._timer_dialog is None:
+            self._timer_dialog = TimerTypeDialog(parent=self)
+        self._timer_dialog.reset(name, duration)
+        return self._timer_dialog
+    
     def _add_timer_type(self):
         """添加计时器类型"""
-        dialog = TimerTypeDialog(parent=self)
+        dialog = self._get_timer_dialog()
         
         if dialog.exec_() == QDialog.Accepted:
             values = dialog.get_values()
@@ -497,10 +1281,15 @@ class SettingsWidget(QWidget):
                 QMessageBox.warning(self, "输入错误", "名称不能为空")
                 return
             
+            type_id = values["name"].strip().translate(_ID_TRANS).lower()
+            if type_id in self.timer_model.type_ids():
+                QMessageBox.warning(self, "输入错误", f"计时器类型 '{values['name']}' 已存在")
+                return
+            
             try:
                 # 添加计时器类型
                 timer_type = {
-                    "id": values["name"].lower().replace(" ", "_"),
+                    "id": type_id,
                     "name": values["name"],
                     "duration": values["duration"],
                     "color": "#4CAF50",
@@ -508,315 +1297,169 @@ class SettingsWidget(QWidget):
                 }
                 self.settings.add_timer_type(timer_type)
                 
-                # 重新加载计时器类型
-                self._load_timer_types()
+                # 只在列表末尾添加新行
+                self.timer_model.append_row(timer_type)
+                
+                # 标记需要在保存设置时写入文件
+                self._timer_types_dirty = True
                 
                 # 发送设置变更信号
                 self.settings_changed.emit("timer.types", None)
                 
             except Exception as e:
-                self.logger.error(f"添加计时器类型失败: {e}")
+                logger.error(f"添加计时器类型失败: {e}")
                 QMessageBox.critical(self, "添加失败", f"添加计时器类型失败: {e}")
     
-    def _export_data(self, format_type):
+    def _export_data(self, format_type, _checked=False):
         """导出数据"""
         try:
-            # 获取保存路径
-            default_name = f"study_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            title, suffix, file_filter, _ = _EXPORT_FORMATS[format_type]
             
-            if format_type == "json":
-                file_path, _ = QFileDialog.getSaveFileName(
-                    self, "导出JSON数据", f"{default_name}.json", "JSON文件 (*.json)"
-                )
-                if file_path:
-                    # 获取所有学习记录
-                    sessions = self.database.get_all_sessions()
-                    
-                    # 转换数据格式以匹配导入模板，包含数据库中所有属性的字段名
-                    # 确保字段顺序与导入模板一致
-                    export_sessions = []
-                    for session in sessions:
-                        export_session = {
-                            "date": session["date"],
-                            "start_time": session["start_time"],
-                            "end_time": session["end_time"],
-                            "timer_type": session.get("timer_type", "study"),
-                            "planned_duration": session["planned_duration"],
-                            "actual_duration": session["actual_duration"],
-                            "completed": session["completed"],
-                            "notes": session.get("notes", ""),
-                            "todo_id": session.get("todo_id"),
-                            "todo_content": session.get("todo_content", ""),
-                            "id": session["id"]
-                        }
-                        export_sessions.append(export_session)
-                    
-                    # 转换为JSON格式
-                    import json
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(export_sessions, f, ensure_ascii=False, indent=4)
-                    
-                    QMessageBox.information(self, "导出成功", f"数据已成功导出到: {file_path}")
-            
-            elif format_type == "sql":
-                file_path, _ = QFileDialog.getSaveFileName(
-                    self, "导出SQL脚本", f"{default_name}.sql", "SQL文件 (*.sql)"
-                )
-                if file_path:
-                    # 获取所有学习记录
-                    sessions = self.database.get_all_sessions()
-                    
-                    # 生成SQL脚本，包含表结构和数据
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write("-- 专注学习计时器数据导出\n")
-                        f.write("-- 导出时间: " + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + "\n\n")
-                        
-                        # 创建表结构
-                        f.write("""CREATE TABLE IF NOT EXISTS study_sessions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    date DATE NOT NULL,
-    start_time DATETIME NOT NULL,
-    end_time DATETIME,
-    timer_type TEXT NOT NULL,
-    planned_duration INTEGER NOT NULL,
-    actual_duration INTEGER,
-    completed BOOLEAN DEFAULT FALSE,
-    notes TEXT,
-    todo_id INTEGER,
-    todo_content TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);\n\n""")
-                        
-                        # 插入数据
-                        f.write("-- 插入学习记录数据\n")
-                        for session in sessions:
-                            f.write(f"INSERT INTO study_sessions (id, date, start_time, end_time, timer_type, ")
-                            f.write(f"planned_duration, actual_duration, completed, notes, todo_id, todo_content) VALUES (")
-                            f.write(f"{session['id']}, '{session['date']}', '{session['start_time']}', ")
-                            f.write(f"'{session['end_time']}', '{session['timer_type']}', {session['planned_duration']}, ")
-                            f.write(f"{session['actual_duration']}, {1 if session['completed'] else 0}, ")
-                            notes = session['notes'].replace("'", "''") if session['notes'] else ""
-                            todo_id = session.get('todo_id', 'NULL')
-                            todo_content = session.get('todo_content', '')
-                            if todo_content:
-                                todo_content = todo_content.replace("'", "''")
-                            f.write(f"'{notes}', {todo_id}, '{todo_content}');\n")
-                    
-                    QMessageBox.information(self, "导出成功", f"数据已成功导出到: {file_path}")
+            # 没有xlsxwriter时需要openpyxl作为后备
+            if (format_type == "excel" and not XLSXWRITER_AVAILABLE
+                    and importlib.util.find_spec("openpyxl") is None):
+                QMessageBox.warning(self, "缺少依赖", "导出Excel需要安装xlsxwriter库，请使用pip安装：\npip install xlsxwriter")
+                return
             
-            elif format_type == "excel":
-                file_path, _ = QFileDialog.getSaveFileName(
-                    self, "导出Excel表格", f"{default_name}.xlsx", "Excel文件 (*.xlsx)"
-                )
-                if file_path:
-                    # 获取所有学习记录
-                    sessions = self.database.get_all_sessions()
-                    
-                    # 导出为Excel
-                    try:
-                        import pandas as pd
-                        
-                        # 转换为DataFrame
-                        df = pd.DataFrame(sessions)
-                        
-                        # 重命名列，包含数据库中所有字段
-                        df = df.rename(columns={
-                            'id': 'ID',
-                            'date': '日期',
-                            'start_time': '开始时间',
-                            'end_time': '结束时间',
-                            'timer_type': '计时器类型',
-                            'planned_duration': '计划时长(秒)',
-                            'actual_duration': '实际时长(秒)',
-                            'completed': '已完成',
-                            'notes': '备注',
-                            'todo_id': '关联待办ID',
-                            'todo_content': '待办内容',
-                            'created_at': '创建时间'
-                        })
-                        
-                        # 导出到Excel
-                        df.to_excel(file_path, index=False)
-                        
-                        QMessageBox.information(self, "导出成功", f"数据已成功导出到: {file_path}")
-                    except ImportError:
-                        QMessageBox.warning(self, "缺少依赖", "导出Excel需要安装pandas和openpyxl库，请使用pip安装：\npip install pandas openpyxl")
+            # 获取保存路径
+            default_name = f"study_data_{datetime.now():%Y%m%d_%H%M%S}.{suffix}"
+            dialog = self._get_save_dialog(title, suffix, file_filter, default_name)
+            if dialog.exec_() == QDialog.Accepted:
+                self._start_export(format_type, dialog.selectedFiles()[0])
         
         except Exception as e:
-            self.logger.error(f"导出数据失败: {e}")
+            logger.error(f"导出数据失败: {e}")
             QMessageBox.critical(self, "导出失败", f"导出数据失败: {str(e)}")
     
-    def _import_json_data(self, file_path):
-        """导入JSON数据"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 验证数据格式
-            if not isinstance(data, list):
-                QMessageBox.warning(self, "格式错误", "JSON文件应包含学习记录数组")
-                return
-            
-            imported_count = 0
-            for record in data:
-                # 验证必需字段
-                required_fields = ['date', 'start_time', 'end_time']
-                if not all(field in record for field in required_fields):
-                    # 兼容旧格式
-                    old_required_fields = ['日期', '开始时间', '结束时间']
-                    if not all(field in record for field in old_required_fields):
-                        continue
-                    # 转换旧格式到新格式
-                    record['date'] = record['日期']
-                    record['start_time'] = record['开始时间']
-                    record['end_time'] = record['结束时间']
-        
-                # 计算持续时间（分钟）
-                duration_minutes = 0
-                if 'actual_duration' in record:
-                    # 使用actual_duration字段（秒）
-                    duration_minutes = record['actual_duration'] / 60
-                elif '实际时长(秒)' in record:
-                    # 兼容旧格式（秒转换为分钟）
-                    duration_minutes = record['实际时长(秒)'] / 60
-                elif 'actual_duration' in record:
-                    # 兼容旧格式（秒转换为分钟）
-                    duration_minutes = record['actual_duration'] / 60 if record['actual_duration'] else 0
-                elif '实际时长(分钟)' in record:
-                    duration_minutes = record['实际时长(分钟)']
-                elif '计划时长(分钟)' in record:
-                    duration_minutes = record['计划时长(分钟)']
-                elif '时长(分钟)' in record:
-                    duration_minutes = record['时长(分钟)']
-        
-                # 插入数据库，包含所有字段
-                try:
-                    self.database.add_session_direct(
-                        record['date'],
-                        record['start_time'],
-                        record['end_time'],
-                        duration_minutes,
-                        record.get('notes', record.get('备注', '')),
-                        record.get('todo_id', record.get('关联待办ID')),
-                        record.get('timer_type', record.get('计时器类型', 'study')),
-                        record.get('planned_duration'),
-                        record.get('actual_duration'),
-                        record.get('completed', True),
-                        record.get('todo_content', ''),
-                        record.get('id')
-                    )
-                    imported_count += 1
-                except Exception as e:
-                    self.logger.warning(f"导入记录失败: {e}")
-                    continue
-        
-            QMessageBox.information(self, "导入成功", f"成功导入 {imported_count} 条学习记录")
-        
-        except json.JSONDecodeError:
-            QMessageBox.warning(self, "格式错误", "无效的JSON文件格式")
-        except Exception as e:
-            QMessageBox.critical(self, "导入失败", f"导入JSON数据失败: {str(e)}")
+    def _get_save_dialog(self, title: str, suffix: str, file_filter: str, file_name: str) -> QFileDialog:
+        """获取重置后的导出保存对话框（各导出格式共用一个实例）"""
+        if self._save_dialog is None:
+            self._save_dialog = QFileDialog(self)
+            self._save_dialog.setAcceptMode(QFileDialog.AcceptSave)
+            # 使用Qt自带的对话框，实例可以复用，不必每次加载系统文件对话框
+            self._save_dialog.setOptions(QFileDialog.DontUseNativeDialog | QFileDialog.DontUseCustomDirectoryIcons)
+            self._save_dialog.filterSelected.connect(self._on_save_filter_selected)
+        self._save_dialog.setWindowTitle(title)
+        self._save_dialog.setNameFilter(file_filter)
+        self._save_dialog.setDefaultSuffix(suffix)
+        # 只设置文件名，目录保持上次导出的位置
+        self._save_dialog.selectFile(file_name)
+        return self._save_dialog
     
-
+    def _on_save_filter_selected(self, name_filter: str):
+        """切换文件类型时同步默认扩展名（如选择压缩文件时补全为.json.gz）"""
+        # 过滤器形如 "JSON压缩文件 (*.json.gz)"
+        start = name_filter.rfind('*.')
+        if start >= 0:
+            self._save_dialog.setDefaultSuffix(name_filter[start + 2:].rstrip(')'))
     
-    def _import_excel_data(self, file_path):
-        """导入Excel数据"""
-        try:
-            import pandas as pd
-            
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
-            
-            # 验证必需列
-            required_columns = ['日期', '开始时间', '结束时间']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                # 检查是否是英文列名
-                english_required_columns = ['date', 'start_time', 'end_time']
-                missing_english_columns = [col for col in english_required_columns if col not in df.columns]
-                
-                if missing_english_columns:
-                    QMessageBox.warning(self, "格式错误", f"Excel文件缺少必需列: {', '.join(missing_columns)} 或 {', '.join(missing_english_columns)}")
-                    return
-                else:
-                    # 重命名英文列名为中文
-                    df = df.rename(columns={
-                        'date': '日期',
-                        'start_time': '开始时间',
-                        'end_time': '结束时间',
-                        'notes': '备注',
-                        'todo_id': '关联待办ID',
-                        'todo_content': '待办内容',
-                        'timer_type': '计时器类型',
-                        'planned_duration': '计划时长(秒)',
-                        'actual_duration': '实际时长(秒)',
-                        'completed': '已完成',
-                        'id': 'ID'
-                    })
-            
-            imported_count = 0
-            for _, row in df.iterrows():
-                try:
-                    # 处理日期格式
-                    date_value = row['日期']
-                    if isinstance(date_value, str):
-                        date_str = date_value
-                    else:
-                        date_str = date_value.strftime('%Y-%m-%d')
-                    
-                    # 计算持续时间（分钟）
-                    duration_minutes = 0
-                    if '实际时长(秒)' in row:
-                        # 使用实际时长(秒)字段
-                        duration_minutes = float(row['实际时长(秒)']) / 60
-                    elif 'actual_duration' in row:
-                        # 兼容旧格式（秒转换为分钟）
-                        duration_minutes = float(row['actual_duration']) / 60 if row['actual_duration'] else 0
-                    elif '实际时长(分钟)' in row:
-                        duration_minutes = float(row['实际时长(分钟)'])
-                    elif '计划时长(分钟)' in row:
-                        duration_minutes = float(row['计划时长(分钟)'])
-                    elif '时长(分钟)' in row:
-                        duration_minutes = float(row['时长(分钟)'])
-                    
-                    # 插入数据库，包含所有字段
-                    self.database.add_session_direct(
-                        date_str,
-                        str(row['开始时间']),
-                        str(row['结束时间']),
-                        duration_minutes,
-                        str(row.get('备注', '')),
-                        row.get('关联待办ID'),
-                        str(row.get('计时器类型', 'study')),
-                        int(row.get('计划时长(秒)', 0)) if '计划时长(秒)' in row else None,
-                        int(row.get('实际时长(秒)', 0)) if '实际时长(秒)' in row else None,
-                        bool(row.get('已完成', True)) if '已完成' in row else True,
-                        str(row.get('待办内容', '')) if '待办内容' in row else '',
-                        int(row.get('ID', 0)) if 'ID' in row else None
-                    )
-                    imported_count += 1
-                except Exception as e:
-                    self.logger.warning(f"导入记录失败: {e}")
-                    continue
-            
-            QMessageBox.information(self, "导入成功", f"成功导入 {imported_count} 条学习记录")
-            
-        except ImportError:
-            QMessageBox.warning(self, "缺少依赖", "导入Excel需要安装pandas和openpyxl库，请使用pip安装：\npip install pandas openpyxl")
-        except Exception as e:
-            QMessageBox.critical(self, "导入失败", f"导入Excel数据失败: {str(e)}")
+    def _start_export(self, format_type: str, file_path: str):
+        """在后台线程中执行导出，界面显示进度"""
+        worker = ExportWorker(self.database, format_type, file_path)
+        worker.progress.connect(self._on_export_progress)
+        worker.finished.connect(self._on_export_finished)
+        worker.error.connect(self._on_export_failed)
+        self._run_data_task(worker, "导出数据", "正在导出数据...")
+    
+    def _start_import(self, format_type: str, file_path: str):
+        """在后台线程中执行导入，界面显示忙碌状态"""
+        worker = ImportWorker(self.database, format_type, file_path)
+        worker.finished.connect(self._on_import_finished)
+        worker.error.connect(self._on_import_failed)
+        self._run_data_task(worker, "导入数据", "正在导入数据...")
+    
+    def _run_data_task(self, worker: QObject, title: str, label: str):
+        """
+        把导出/导入工作对象移到新线程中运行
+        
+        Args:
+            worker: 带有run方法及finished、error信号的工作对象
+            title: 进度对话框标题
+            label: 进度对话框提示文字
+        """
+        for button in self._data_buttons:
+            button.setEnabled(False)
+        
+        # 记录较少时很快完成，进度对话框只在耗时超过500毫秒时出现
+        self._data_progress = QProgressDialog(label, None, 0, 0, self)
+        self._data_progress.setWindowTitle(title)
+        self._data_progress.setWindowModality(Qt.WindowModal)
+        self._data_progress.setMinimumDuration(500)
+        
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        
+        # 保持引用，避免线程运行期间被回收
+        self._data_thread = thread
+        self._data_worker = worker
+        thread.start()
+    
+    def _on_export_progress(self, done: int, total: int):
+        """更新导出进度"""
+        if self._data_progress is not None:
+            self._data_progress.setMaximum(total)
+            self._data_progress.setValue(done)
+    
+    def _on_export_finished(self, file_path: str):
+        """导出完成"""
+        self._end_data_task()
+        self._notify(f"数据已成功导出到: {file_path}")
+    
+    def _notify(self, message: str, msecs: int = 2500):
+        """在页面底部显示一条自动消失的提示，不阻塞界面"""
+        self._toast.setText(message)
+        self._toast.adjustSize()
+        self._toast.move((self.width() - self._toast.width()) // 2,
+                         self.height() - self._toast.height() - 20)
+        self._toast.raise_()
+        self._toast.show()
+        # 重新计时，连续提示时以最后一条为准
+        self._toast_timer.start(msecs)
+    
+    def _on_export_failed(self, message: str):
+        """导出失败"""
+        self._end_data_task()
+        QMessageBox.critical(self, "导出失败", f"导出数据失败: {message}")
+    
+    def _on_import_finished(self, imported_count: int):
+        """导入完成"""
+        self._end_data_task()
+        QMessageBox.information(self, "导入成功", f"成功导入 {imported_count} 条学习记录")
+    
+    def _on_import_failed(self, title: str, message: str):
+        """导入失败"""
+        self._end_data_task()
+        if title == "导入失败":
+            QMessageBox.critical(self, title, message)
+        else:
+            QMessageBox.warning(self, title, message)
+    
+    def _end_data_task(self):
+        """关闭进度对话框并恢复导出/导入按钮"""
+        if self._data_progress is not None:
+            self._data_progress.close()
+            self._data_progress.deleteLater()
+            self._data_progress = None
+        self._data_thread = None
+        self._data_worker = None
+        for button in self._data_buttons:
+            button.setEnabled(True)
     
     def _edit_timer_type(self):
         """编辑计时器类型"""
-        current_item = self.timer_list.currentItem()
+        current_index = self.timer_list.currentIndex()
         
-        if not current_item:
+        if not current_index.isValid():
             QMessageBox.warning(self, "选择错误", "请先选择一个计时器类型")
             return
         
-        timer_type = current_item.data(Qt.UserRole)
-        dialog = TimerTypeDialog(timer_type["name"], timer_type["duration"], parent=self)
+        timer_type = self.timer_model.row_data(current_index.row())
+        dialog = self._get_timer_dialog(timer_type["name"], timer_type["duration"])
         
         if dialog.exec_() == QDialog.Accepted:
             values = dialog.get_values()
@@ -833,25 +1476,29 @@ class SettingsWidget(QWidget):
                 }
                 self.settings.update_timer_type(timer_type["id"], updates)
                 
-                # 重新加载计时器类型
-                self._load_timer_types()
+                # 只刷新被修改的行
+                timer_type.update(updates)
+                self.timer_model.refresh_row(current_index.row())
+                
+                # 标记需要在保存设置时写入文件
+                self._timer_types_dirty = True
                 
                 # 发送设置变更信号
                 self.settings_changed.emit("timer.types", None)
                 
             except Exception as e:
-                self.logger.error(f"编辑计时器类型失败: {e}")
+                logger.error(f"编辑计时器类型失败: {e}")
                 QMessageBox.critical(self, "编辑失败", f"编辑计时器类型失败: {e}")
     
     def _delete_timer_type(self):
         """删除计时器类型"""
-        current_item = self.timer_list.currentItem()
+        current_index = self.timer_list.currentIndex()
         
-        if not current_item:
+        if not current_index.isValid():
             QMessageBox.warning(self, "选择错误", "请先选择一个计时器类型")
             return
         
-        timer_type = current_item.data(Qt.UserRole)
+        timer_type = self.timer_model.row_data(current_index.row())
         
         # 确认删除
         reply = QMessageBox.question(self, "确认删除", f"确定要删除计时器类型 '{timer_type['name']}' 吗？",
@@ -862,26 +1509,20 @@ class SettingsWidget(QWidget):
                 # 删除计时器类型
                 self.settings.remove_timer_type(timer_type["id"])
                 
-                # 重新加载计时器类型
-                self._load_timer_types()
+                # 只移除被删除的行
+                self.timer_model.remove_row(current_index.row())
+                
+                # 标记需要在保存设置时写入文件
+                self._timer_types_dirty = True
                 
                 # 发送设置变更信号
                 self.settings_changed.emit("timer.types", None)
                 
             except Exception as e:
-                self.logger.error(f"删除计时器类型失败: {e}")
+                logger.error(f"删除计时器类型失败: {e}")
                 QMessageBox.critical(self, "删除失败", f"删除计时器类型失败: {e}")
     
-    def _browse_sound_file(self):
-        """浏览音乐文件"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择提醒音乐", "", "音频文件 (*.mp3 *.wav);;所有文件 (*.*)"
-        )
-        
-        if file_path:
-            self.sound_file_edit.setText(file_path)
-
-    def _import_data(self, format_type):
+    def _import_data(self, format_type, _checked=False):
         """导入数据"""
         try:
             if format_type == "json":
@@ -889,38 +1530,38 @@ class SettingsWidget(QWidget):
                     self, "选择JSON文件", "", "JSON文件 (*.json)"
                 )
                 if file_path:
-                    self._import_json_data(file_path)
+                    self._start_import(format_type, file_path)
             elif format_type == "excel":
                 file_path, _ = QFileDialog.getOpenFileName(
                     self, "选择Excel文件", "", "Excel文件 (*.xlsx *.xls)"
                 )
                 if file_path:
-                    self._import_excel_data(file_path)
+                    self._start_import(format_type, file_path)
         except Exception as e:
-            self.logger.error(f"导入数据失败: {e}")
+            logger.error(f"导入数据失败: {e}")
             QMessageBox.critical(self, "导入失败", f"导入数据失败: {str(e)}")
     
     def _import_sound_file(self):
         """导入音频文件"""
         # 选择音频文件
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择音频文件", "", "音频文件 (*.mp3 *.wav);;所有文件 (*.*)"
+            self, "选择音频文件", self._last_sound_dir, "音频文件 (*.mp3 *.wav);;所有文件 (*.*)",
+            options=_IMPORT_DIALOG_OPTIONS
         )
         
         if file_path:
+            self._last_sound_dir = os.path.dirname(file_path)
             try:
                 # 获取文件名
                 filename = os.path.basename(file_path)
                 
                 # 确保resources/sounds目录存在
-                sounds_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "sounds")
-                os.makedirs(sounds_dir, exist_ok=True)
+                os.makedirs(_SOUNDS_DIR, exist_ok=True)
                 
                 # 目标文件路径
-                target_path = os.path.join(sounds_dir, filename)
+                target_path = os.path.join(_SOUNDS_DIR, filename)
                 
                 # 复制文件
-                import shutil
                 shutil.copy2(file_path, target_path)
                 
                 # 重新加载音频文件列表
@@ -929,7 +1570,7 @@ class SettingsWidget(QWidget):
                 QMessageBox.information(self, "导入成功", f"音频文件已导入: {filename}")
                 
             except Exception as e:
-                self.logger.error(f"导入音频文件失败: {e}")
+                logger.error(f"导入音频文件失败: {e}")
                 QMessageBox.critical(self, "导入失败", f"导入音频文件失败: {str(e)}")
     
     def _import_wallpaper(self):
@@ -939,23 +1580,21 @@ class SettingsWidget(QWidget):
             file_path, _ = QFileDialog.getOpenFileName(
                 self,
                 "选择壁纸文件",
-                "",
-                "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif)"
+                self._last_wallpaper_dir,
+                "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif)",
+                options=_IMPORT_DIALOG_OPTIONS
             )
             
             if file_path:
+                self._last_wallpaper_dir = os.path.dirname(file_path)
                 # 获取文件名
                 filename = os.path.basename(file_path)
                 
-                # 获取壁纸目录路径
-                wallpaper_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "wallpaper")
-                
-                # 如果目录不存在则创建
-                if not os.path.exists(wallpaper_dir):
-                    os.makedirs(wallpaper_dir)
+                # 如果壁纸目录不存在则创建
+                os.makedirs(_WALLPAPER_DIR, exist_ok=True)
                 
                 # 目标文件路径
-                target_path = os.path.join(wallpaper_dir, filename)
+                target_path = os.path.join(_WALLPAPER_DIR, filename)
                 
                 # 如果文件已存在，询问是否覆盖
                 if os.path.exists(target_path):
@@ -984,69 +1623,80 @@ class SettingsWidget(QWidget):
                 QMessageBox.information(self, "导入成功", f"壁纸 {filename} 导入成功")
                 
         except Exception as e:
-            self.logger.error(f"导入壁纸文件失败: {e}")
+            logger.error(f"导入壁纸文件失败: {e}")
             QMessageBox.critical(self, "导入失败", f"导入壁纸文件失败: {e}")
     
     def _load_sound_files(self):
         """加载音频文件列表"""
+        combo = self.sound_file_combo
+        # 清空和重新填充期间暂停重绘，整个列表只刷新一次
+        combo.setUpdatesEnabled(False)
         try:
             # 清空下拉列表
-            self.sound_file_combo.clear()
-            
-            # 获取resources/sounds目录路径
-            sounds_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "sounds")
+            combo.clear()
             
-            # 如果目录不存在，创建它
-            if not os.path.exists(sounds_dir):
-                os.makedirs(sounds_dir, exist_ok=True)
+            # 获取resources/sounds目录的修改时间，目录不存在时创建它
+            try:
+                mtime = os.stat(_SOUNDS_DIR).st_mtime_ns
+            except FileNotFoundError:
+                os.makedirs(_SOUNDS_DIR, exist_ok=True)
                 return
             
-            # 获取所有音频文件
-            sound_files = []
-            for file in os.listdir(sounds_dir):
-                if file.lower().endswith((".mp3", ".wav")):
-                    sound_files.append(file)
+            # 获取所有音频文件，目录没有变化时使用上次的结果
+            key = (_SOUNDS_DIR, mtime)
+            sound_files = _SOUND_LIST_CACHE.get(key)
+            if sound_files is None:
+                sound_files = [file for file in os.listdir(_SOUNDS_DIR)
+                               if file.lower().endswith((".mp3", ".wav"))]
+                _SOUND_LIST_CACHE.clear()
+                _SOUND_LIST_CACHE[key] = sound_files
             
             # 添加到下拉列表
-            self.sound_file_combo.addItems(sound_files)
+            combo.addItems(sound_files)
             
         except Exception as e:
-            self.logger.error(f"加载音频文件列表失败: {e}")
+            logger.error(f"加载音频文件列表失败: {e}")
+        
+        finally:
+            combo.setUpdatesEnabled(True)
 
-    def _load_background_files(self):
-        """加载壁纸文件列表"""
-        self.background_file_combo.clear()
-        self.background_file_combo.addItem("无")
+    def _load_background_files(self, update_preview: bool = True):
+        """
+        加载壁纸文件列表
         
-        # 获取壁纸目录路径
-        wallpaper_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "wallpaper")
+        Args:
+            update_preview: 填充后是否立即更新背景预览
+        """
+        filenames = ["无"]
         
-        # 如果目录不存在则创建
-        if not os.path.exists(wallpaper_dir):
-            os.makedirs(wallpaper_dir)
+        # 如果壁纸目录不存在则创建
+        os.makedirs(_WALLPAPER_DIR, exist_ok=True)
         
         # 支持的图片格式
         image_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
         
         # 遍历壁纸目录中的文件
-        if os.path.exists(wallpaper_dir):
-            for filename in os.listdir(wallpaper_dir):
-                if filename.lower().endswith(image_extensions):
-                    self.background_file_combo.addItem(filename)
+        filenames.extend(filename for filename in os.listdir(_WALLPAPER_DIR)
+                         if filename.lower().endswith(image_extensions))
+        
+        # 一次性填充列表，期间屏蔽信号，避免每添加一项都重新加载预览图片
+        combo = self.background_file_combo
+        combo.setUpdatesEnabled(False)
+        blocker = QSignalBlocker(combo)
+        try:
+            combo.clear()
+            combo.addItems(filenames)
+        finally:
+            # 恢复到之前的屏蔽状态（调用方可能也在屏蔽信号）
+            blocker.unblock()
+            combo.setUpdatesEnabled(True)
+        if update_preview:
+            self._update_background_preview()
 
     def _load_timer_types(self):
         """加载计时器类型"""
-        # 清空列表
-        self.timer_list.clear()
-        
-        # 获取计时器类型列表
-        timer_types = self.settings.get_timer_types()
-        
-        # 添加到列表中
-        for timer_type in timer_types:
-            item = QListWidgetItem(timer_type["name"])
-            item.setData(Qt.UserRole, timer_type)
-            self.timer_list.addItem(item)
+        # 获取计时器类型列表并重置模型
+        self.timer_model.set_rows(self.settings.get_timer_types())
 
     def _update_background_preview(self):
         """更新背景预览"""
@@ -1061,8 +1711,7 @@ class SettingsWidget(QWidget):
                 return
             
             # 构建完整文件路径
-            wallpaper_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "wallpaper")
-            full_path = os.path.join(wallpaper_dir, selected_file)
+            full_path = os.path.join(_WALLPAPER_DIR, selected_file)
             
             # 检查文件是否存在
             if not os.path.exists(full_path):
@@ -1102,6 +1751,6 @@ class SettingsWidget(QWidget):
             self.background_preview.setPixmap(scaled_pixmap)
             
         except Exception as e:
-            self.logger.error(f"更新背景预览失败: {e}")
+            logger.error(f"更新背景预览失败: {e}")
             self.background_preview.clear()
             self.background_preview.setText("预览加载失败")
\ No newline at end of file
@@ -15,11 +15,13 @@ from PyQt5.QtGui import QColor, QPalette, QPainter, QFont
 from PyQt5.QtChart import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis, QBarSeries, QBarSet, QBarCategoryAxis
 
 from datetime import datetime, date, timedelta
+from functools import partial, lru_cache
 import logging
 
 
+@lru_cache(maxsize=256)
 def seconds_to_minutes_text(seconds: int) -> str:
-    """将秒转换为分钟文本"""
+    """将秒转换为分钟文本（结果缓存，常见时长每次刷新表格都会重复出现）"""
     m = round(max(0, int(seconds)) / 60.0, 1)
     return f"{m}"
 
@@ -39,6 +41,7 @@ class StatsWidget(QWidget):
         self.database = database
         self.logger = logging.getLogger(__name__)
         self.current_selected_date = None  # 初始化当前选中的日期
+        self._note_dialog = None  # 编辑备注对话框，首次使用时创建
         
         self._build_ui()
         self._setup_styles()
@@ -636,9 +639,8 @@ class StatsWidget(QWidget):
                         background-color: #c0392b;
                     }
                 """)
-                # 使用闭包保存当前会话ID
-                session_id = session['id']
-                delete_btn.clicked.connect(lambda checked, sid=session_id: self._delete_session(sid))
+                # 绑定当前会话ID
+                delete_btn.clicked.connect(partial(self._delete_session, session['id']))
                 self.sessions_table.setCellWidget(i, 6, delete_btn)
             
             if stats and len(stats) > 0:
@@ -769,7 +771,7 @@ class StatsWidget(QWidget):
             self.logger.error(f"添加学习记录失败: {e}")
             QMessageBox.critical(self, "添加失败", f"添加学习记录失败: {str(e)}")
     
-    def _delete_session(self, session_id):
+    def _delete_session(self, session_id, _checked=False):
         """删除学习会话"""
         from PyQt5.QtWidgets import QMessageBox
         
@@ -815,9 +817,58 @@ class StatsWidget(QWidget):
         elif column == 5:
             self._edit_session_todo(row, column)
     
+    def _get_note_dialog(self):
+        """获取编辑备注对话框（各会话共用一个实例）"""
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QDialogButtonBox
+        
+        if self._note_dialog is None:
+            # 创建编辑对话框
+            dialog = QDialog(self)
+            dialog.setWindowTitle("编辑备注")
+            dialog.setMinimumWidth(400)
+            
+            layout = QVBoxLayout(dialog)
+            
+            # 添加说明标签
+            dialog.msg_label = QLabel()
+            dialog.msg_label.setStyleSheet("font-size: 14px; color: #2c3e50;")
+            layout.addWidget(dialog.msg_label)
+            
+            # 添加备注输入框
+            dialog.note_input = QLineEdit()
+            dialog.note_input.setPlaceholderText("记录这段时间做了什么...")
+            dialog.note_input.setStyleSheet("padding: 8px;")
+            layout.addWidget(dialog.note_input)
+            
+            # 添加按钮
+            button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+            button_box.accepted.connect(dialog.accept)
+            button_box.rejected.connect(dialog.reject)
+            layout.addWidget(button_box)
+            
+            # 设置对话框样式
+            dialog.setStyleSheet("""
+                QDialog {
+                    background-color: #ecf0f1;
+                }
+                QPushButton {
+                    background-color: #3498db;
+                    color: white;
+                    border: none;
+                    padding: 8px 16px;
+                    border-radius: 4px;
+                }
+                QPushButton:hover {
+                    background-color: #2980b9;
+                }
+            """)
+            self._note_dialog = dialog
+        
+        return self._note_dialog
+    
     def _edit_session_note(self, row, column):
         """编辑会话备注"""
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QDialogButtonBox
+        from PyQt5.QtWidgets import QDialog
         
         # 获取会话ID
         session_id_item = self.sessions_table.item(row, 0)
@@ -827,46 +878,12 @@ class StatsWidget(QWidget):
         session_id = int(session_id_item.text())
         current_note = self.sessions_table.item(row, column).text()
         
-        # 创建编辑对话框
-        dialog = QDialog(self)
-        dialog.setWindowTitle("编辑备注")
-        dialog.setMinimumWidth(400)
-        
-        layout = QVBoxLayout(dialog)
-        
-        # 添加说明标签
-        msg_label = QLabel(f"编辑会话 #{session_id} 的备注:")
-        msg_label.setStyleSheet("font-size: 14px; color: #2c3e50;")
-        layout.addWidget(msg_label)
-        
-        # 添加备注输入框
-        note_input = QLineEdit(current_note)
-        note_input.setPlaceholderText("记录这段时间做了什么...")
-        note_input.setStyleSheet("padding: 8px;")
-        layout.addWidget(note_input)
-        
-        # 添加按钮
-        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.accepted.connect(dialog.accept)
-        button_box.rejected.connect(dialog.reject)
-        layout.addWidget(button_box)
-        
-        # 设置对话框样式
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #ecf0f1;
-            }
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
+        # 复用编辑对话框，只更新内容
+        dialog = self._get_note_dialog()
+        dialog.msg_label.setText(f"编辑会话 #{session_id} 的备注:")
+        note_input = dialog.note_input
+        note_input.setText(current_note)
+        note_input.setFocus()
         
         # 显示对话框
         if dialog.exec_() == QDialog.Accepted:
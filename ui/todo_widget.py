@@ -133,6 +133,9 @@ class TodoItem(QWidget):
 class TodoWidget(QWidget):
     """TODO列表页面组件"""
     
+    # 待办事项增删改后发出，供其他页面刷新缓存
+    todos_changed = pyqtSignal()
+    
     def __init__(self, settings: Settings, database: Database, parent=None):
         super().__init__(parent)
         self.settings = settings
@@ -238,33 +241,38 @@ class TodoWidget(QWidget):
     
     def load_todo_items(self):
         """加载待办事项列表"""
-        self.todo_list.clear()
-        
         # 获取当前日期的待办事项
         date_str = self.current_date.isoformat()
         todo_items = self.database.get_todo_items(date_str, include_completed=True)
         
-        if not todo_items:
-            # 如果没有待办事项，显示提示
-            empty_item = QListWidgetItem()
-            empty_widget = QLabel("今天没有待办事项，添加一个吧！")
-            empty_widget.setAlignment(Qt.AlignCenter)
-            empty_widget.setStyleSheet("color: #7f8c8d; padding: 20px;")
+        # 重建列表期间暂停重绘，全部添加完后只刷新一次
+        self.todo_list.setUpdatesEnabled(False)
+        try:
+            self.todo_list.clear()
             
-            empty_item.setSizeHint(empty_widget.sizeHint())
-            self.todo_list.addItem(empty_item)
-            self.todo_list.setItemWidget(empty_item, empty_widget)
-            return
-        
-        # 先添加未完成的项目
-        incomplete_items = [item for item in todo_items if not item['completed']]
-        for todo_item in incomplete_items:
-            self._add_todo_item_to_list(todo_item)
-        
-        # 再添加已完成的项目
-        complete_items = [item for item in todo_items if item['completed']]
-        for todo_item in complete_items:
-            self._add_todo_item_to_list(todo_item)
+            if not todo_items:
+                # 如果没有待办事项，显示提示
+                empty_item = QListWidgetItem()
+                empty_widget = QLabel("今天没有待办事项，添加一个吧！")
+                empty_widget.setAlignment(Qt.AlignCenter)
+                empty_widget.setStyleSheet("color: #7f8c8d; padding: 20px;")
+                
+                empty_item.setSizeHint(empty_widget.sizeHint())
+                self.todo_list.addItem(empty_item)
+                self.todo_list.setItemWidget(empty_item, empty_widget)
+                return
+            
+            # 先添加未完成的项目
+            incomplete_items = [item for item in todo_items if not item['completed']]
+            for todo_item in incomplete_items:
+                self._add_todo_item_to_list(todo_item)
+            
+            # 再添加已完成的项目
+            complete_items = [item for item in todo_items if item['completed']]
+            for todo_item in complete_items:
+                self._add_todo_item_to_list(todo_item)
+        finally:
+            self.todo_list.setUpdatesEnabled(True)
     
     def _add_todo_item_to_list(self, todo_data):
         """将待办事项添加到列表中"""
@@ -298,6 +306,7 @@ class TodoWidget(QWidget):
         # 添加到数据库
         date_str = self.current_date.isoformat()
         todo_id = self.database.add_todo_item(content, date_str)
+        self.todos_changed.emit()
         
         # 清空输入框
         self.new_todo_input.clear()
@@ -313,6 +322,7 @@ class TodoWidget(QWidget):
     def on_item_completed_changed(self, todo_id, completed):
         """项目完成状态变化处理"""
         self.database.update_todo_item(todo_id, completed=completed)
+        self.todos_changed.emit()
         # 延迟重新加载，以便用户可以看到状态变化
         from PyQt5.QtCore import QTimer
         QTimer.singleShot(500, self.load_todo_items)
@@ -320,8 +330,10 @@ class TodoWidget(QWidget):
     def on_item_deleted(self, todo_id):
         """项目删除处理"""
         self.database.delete_todo_item(todo_id)
+        self.todos_changed.emit()
         self.load_todo_items()
     
     def on_item_edited(self, todo_id, new_content):
         """项目编辑处理"""
-        self.database.update_todo_item(todo_id, content=new_content)
\ No newline at end of file
+        self.database.update_todo_item(todo_id, content=new_content)
+        self.todos_changed.emit()
\ No newline at end of file